@@ -156,6 +156,11 @@ async def upload_dataset(file: UploadFile = File(...)):
         # CRITICAL: Capture bytes from the underlying SpooledTemporaryFile
         # This bypasses any async stream issues completely
         spooled_file = file.file  # This is a SpooledTemporaryFile
+        
+        # Reject oversized uploads before reading them into memory
+        engine = DataIngestionEngine()
+        engine.validate_size(spooled_file.seek(0, os.SEEK_END))
+        
         spooled_file.seek(0)  # Ensure we're at the start
         file_bytes = spooled_file.read()  # Sync read from SpooledTemporaryFile
         
@@ -166,25 +171,26 @@ async def upload_dataset(file: UploadFile = File(...)):
         logger.info(f"Captured {len(file_bytes)} bytes from {filename}")
         
         # Process using the bulletproof ingestion engine
-        engine = DataIngestionEngine()
         registry = engine.ingest_from_bytes(file_bytes, filename, dataset_id)
         
-        # Get primary dataset for role detection
-        primary_df = registry.get_primary_dataset()
-        primary_sheet = registry.list_datasets()[0]
-        
-        # Detect column roles
-        role_mapper = ColumnRoleMapper()
-        column_roles = role_mapper.detect_roles(primary_df)
-        
         # Create uploads directory and save file for later analysis
         upload_dir = Path("/app/decision-ledger/data/uploads")
         upload_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save file to disk using captured bytes
+        # Save file to disk using captured bytes, then drop them so the raw
+        # upload is not held alongside the parsed frames
         file_path = upload_dir / filename
         with open(file_path, 'wb') as f:
             f.write(file_bytes)
+        del file_bytes
+        
+        # Get primary dataset for role detection
+        primary_df = registry.get_primary_dataset()
+        primary_sheet = registry.list_datasets()[0]
+        
+        # Detect column roles
+        role_mapper = ColumnRoleMapper()
+        column_roles = role_mapper.detect_roles(primary_df)
         
         # Sanitize column_roles for JSON serialization (handles NaN, Inf)
         safe_column_roles = sanitize_for_json(column_roles)
@@ -263,7 +269,7 @@ async def analyze_intelligence(request: ForecastRequest):
         # Load data using universal ingestion
         ingestion = DataIngestion()
         ingestion_result = await ingestion.ingest_file(file_path)
-        datasets = ingestion_result['dataframes']
+        datasets = await ingestion.load_sheets(ingestion_result)
         
         logger.info(f"Running Decision Intelligence Engine on {len(datasets)} sheets")
         
@@ -1141,7 +1147,7 @@ async def generate_forecast(request: ForecastRequest):
         ingestion = DataIngestion()
         ingestion_result = await ingestion.ingest_file(file_path)
         primary_sheet = dataset.get("primary_sheet", ingestion_result['sheets'][0])
-        df = ingestion_result['dataframes'][primary_sheet]
+        df = await ingestion.load_sheet(ingestion_result, primary_sheet)
         
         # Get TIME column if present
         time_col = None
@@ -1242,7 +1248,7 @@ async def generate_roi_curve(request: ForecastRequest):
         ingestion = DataIngestion()
         ingestion_result = await ingestion.ingest_file(file_path)
         primary_sheet = dataset.get("primary_sheet", ingestion_result['sheets'][0])
-        df = ingestion_result['dataframes'][primary_sheet]
+        df = await ingestion.load_sheet(ingestion_result, primary_sheet)
         
         # Fit ROI curve models
         roi_curve = ROICurve()
@@ -1394,7 +1400,7 @@ async def analyze_dataset(request: ForecastRequest):
         
         # Get primary dataframe
         primary_sheet = dataset.get("primary_sheet", ingestion_result['sheets'][0])
-        df = ingestion_result['dataframes'][primary_sheet]
+        df = await ingestion.load_sheet(ingestion_result, primary_sheet)
         
         # Run analysis pipeline
         emergent_key = os.getenv("EMERGENT_LLM_KEY")
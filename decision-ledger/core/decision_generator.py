@@ -441,16 +441,20 @@ class DecisionGenerator:
             actions.append(action)
             self.actions.append(action)
         
+        # Systemic candidates list every entity, so test membership
+        # against a set rather than scanning the list per gap
+        affected_entities = set(candidate.affected_entities)
+        
         # Collect supporting gaps
         supporting_gaps = [
             gap for gap in context.gaps
-            if gap.entity_id in candidate.affected_entities
+            if gap.entity_id in affected_entities
         ]
         
         # Collect supporting constraints
         supporting_constraints = [
             c for c in context.constraints
-            if c.entity_id in candidate.affected_entities or c.entity_id is None
+            if c.entity_id in affected_entities or c.entity_id is None
         ]
         
         return Decision(
@@ -8,13 +8,155 @@ Groups decisions by:
 Aggregates hundreds of signals into actionable decision themes with drill-down.
 """
 
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Set, Tuple
 from dataclasses import dataclass, field, asdict
 from collections import defaultdict
+from functools import lru_cache
+from itertools import islice
+import hashlib
 import re
 
+import numpy as np
 
-@dataclass
+
+class _NameMatcher:
+    """Find every name contained in a text with a single regex scan.
+    
+    Names are compiled into a trie-shaped alternation inside a lookahead,
+    so the regex engine walks each text position once per trie branch
+    instead of running one substring search per name. The longest name
+    starting at a position is returned by the scan; shorter names that are
+    prefixes of it are added from a precomputed table.
+    """
+    
+    def __init__(self, names: Set[str]):
+        self.names = set(names)
+        self._pattern = None
+        self._prefixes: Dict[str, List[str]] = {}
+        
+        if not self.names:
+            return
+        
+        trie: Dict[str, Any] = {}
+        for name in self.names:
+            node = trie
+            for char in name:
+                node = node.setdefault(char, {})
+            node[""] = True
+        
+        self._pattern = re.compile(f"(?=({self._trie_to_regex(trie)}))")
+        
+        for name in self.names:
+            self._prefixes[name] = [
+                name[:i] for i in range(1, len(name)) if name[:i] in self.names
+            ]
+    
+    def _trie_to_regex(self, node: Dict[str, Any]) -> str:
+        """Convert a trie node into a regex alternation (children before end)."""
+        branches = [
+            re.escape(char) + self._trie_to_regex(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if "" in node:
+            branches.append("")
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+    
+    def find_all(self, text: str) -> Set[str]:
+        """Return every name that occurs as a substring of ``text``."""
+        found = set()
+        if self._pattern is None:
+            return found
+        
+        for match in self._pattern.finditer(text):
+            name = match.group(1)
+            if name and name not in found:
+                found.add(name)
+                found.update(self._prefixes[name])
+        
+        return found
+
+
+def _bounded_levenshtein(a: str, b: str, tol: int) -> int:
+    """Edit distance between ``a`` and ``b``, capped at ``tol + 1``.
+    
+    Only cells within ``tol`` of the diagonal are computed and the scan
+    stops as soon as a whole row exceeds ``tol``, so the cost is
+    O(tol * len) rather than the full O(len(a) * len(b)) table.
+    """
+    over = tol + 1
+    if abs(len(a) - len(b)) > tol:
+        return over
+    if a == b:
+        return 0
+    
+    len_b = len(b)
+    prev = [j if j <= tol else over for j in range(len_b + 1)]
+    
+    for i in range(1, len(a) + 1):
+        cur = [over] * (len_b + 1)
+        cur[0] = i if i <= tol else over
+        row_min = cur[0]
+        char_a = a[i - 1]
+        
+        for j in range(max(1, i - tol), min(len_b, i + tol) + 1):
+            cost = 0 if char_a == b[j - 1] else 1
+            value = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost, over)
+            cur[j] = value
+            if value < row_min:
+                row_min = value
+        
+        if row_min > tol:
+            return over
+        prev = cur
+    
+    return prev[len_b]
+
+
+_ROOT_CAUSE_NAMES = {
+    "investigate": "Performance Investigation Required",
+    "investigate_systemic": "Systemic Issues Detected",
+    "escalate": "Escalation Required",
+    "monitor": "Active Monitoring Needed",
+    "resolve": "Resolution Actions Pending",
+    "prioritize": "Prioritization Decisions",
+    "allocate": "Resource Allocation Issues",
+    "sequence": "Dependency Management",
+    "verify_targets": "Target Calibration Review"
+}
+
+
+# Capitalized word runs in a summary, used as a cheap entity-name proxy
+_CAPPHRASE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+
+# Theme severity bands: score >= 0.4 is "warning", score >= 0.7 is "critical"
+_SEVERITY_THRESHOLDS = np.array([0.4, 0.7])
+_SEVERITY_LABELS = np.array(["normal", "warning", "critical"])
+
+
+@lru_cache(maxsize=256)
+def _root_cause_name(decision_type: str) -> str:
+    """Get human-readable root cause name."""
+    return _ROOT_CAUSE_NAMES.get(decision_type, decision_type.replace("_", " ").title())
+
+
+@lru_cache(maxsize=256)
+def _format_metric_name(metric: str) -> str:
+    """Format metric name for display."""
+    return metric.replace("_", " ").title()
+
+
+def _unique(items: Iterable[str]) -> Iterator[str]:
+    """Yield items in first-seen order, skipping repeats."""
+    seen = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
+
+
+@dataclass(slots=True)
 class DecisionTheme:
     """A grouped theme containing multiple related decisions."""
     id: str
@@ -34,7 +176,7 @@ class DecisionTheme:
     drill_down_available: bool = True
 
 
-@dataclass 
+@dataclass(slots=True)
 class GroupingSummary:
     """Summary of all decision groupings."""
     total_decisions: int
@@ -73,10 +215,16 @@ class DecisionGroupingEngine:
         if not decisions:
             return [], GroupingSummary(0, 0, {}, 0, 0.0)
         
+        # Normalize decision text once for all grouping passes
+        decision_index = self._build_decision_index(decisions)
+        
+        # Stack impact/confidence/urgency scores into one (N, 3) array
+        scores = self._build_score_matrix(decisions)
+        
         # Group by different dimensions
-        root_cause_themes = self._group_by_root_cause(decisions)
-        metric_themes = self._group_by_metric(decisions, gaps)
-        entity_themes = self._group_by_entity_cluster(decisions, entities)
+        root_cause_themes = self._group_by_root_cause(decisions, scores)
+        metric_themes = self._group_by_metric(decisions, scores, decision_index, gaps)
+        entity_themes = self._group_by_entity_cluster(decisions, scores, decision_index, entities)
         
         # Merge and deduplicate themes
         all_themes = self._merge_themes(root_cause_themes, metric_themes, entity_themes)
@@ -92,47 +240,107 @@ class DecisionGroupingEngine:
         
         return all_themes, summary
     
-    def _group_by_root_cause(
+    def _build_decision_index(
         self,
         decisions: List[Dict[str, Any]]
-    ) -> List[DecisionTheme]:
-        """Group decisions by inferred root cause."""
-        themes = []
+    ) -> List[Dict[str, Any]]:
+        """Pre-normalize decision text and evidence in a single pass.
         
-        # Group by decision type (proxy for root cause)
-        type_groups: Dict[str, List[Dict]] = defaultdict(list)
+        Each entry is aligned with ``decisions`` and holds the lowercased
+        summary/reasoning plus the lowercased evidence metrics and entities,
+        so grouping passes never lowercase the same string twice.
+        """
+        decision_index = []
         
         for d in decisions:
+            evidence_metrics = set()
+            evidence_entities = set()
+            for ev in d.get("evidence", {}).get("supporting_evidence", []):
+                if ev.get("type") == "gap":
+                    m = ev.get("metric", "")
+                    if m:
+                        evidence_metrics.add(m.lower())
+                entity = ev.get("entity", "")
+                if entity:
+                    evidence_entities.add(entity.lower())
+            
+            decision_index.append({
+                "lower_summary": d.get("summary", "").lower(),
+                "lower_reasoning": d.get("reasoning", "").lower(),
+                "evidence_metrics": evidence_metrics,
+                "evidence_entities": evidence_entities
+            })
+        
+        return decision_index
+    
+    def _build_score_matrix(self, decisions: List[Dict[str, Any]]) -> np.ndarray:
+        """Stack impact, confidence and urgency scores into an (N, 3) array."""
+        return np.array(
+            [
+                [
+                    d.get("impact_score", 0),
+                    d.get("confidence_score", 0),
+                    d.get("urgency_score", 0)
+                ]
+                for d in decisions
+            ],
+            dtype=np.float64
+        ).reshape(len(decisions), 3)
+    
+    def _unique_by_id(
+        self,
+        decisions: List[Dict[str, Any]],
+        group: List[int]
+    ) -> List[int]:
+        """Deduplicate decision indices by decision id, keeping first occurrence."""
+        seen_ids = set()
+        unique_group = []
+        for idx in group:
+            decision_id = decisions[idx].get("id")
+            if decision_id not in seen_ids:
+                seen_ids.add(decision_id)
+                unique_group.append(idx)
+        return unique_group
+    
+    def _group_by_root_cause(
+        self,
+        decisions: List[Dict[str, Any]],
+        scores: np.ndarray
+    ) -> List[DecisionTheme]:
+        """Group decisions by inferred root cause."""
+        # Group decision indices by decision type (proxy for root cause)
+        type_groups: Dict[str, List[int]] = defaultdict(list)
+        
+        for idx, d in enumerate(decisions):
             dtype = d.get("decision_type", "unknown")
-            type_groups[dtype].append(d)
+            type_groups[dtype].append(idx)
         
+        groups = []
         for dtype, group in type_groups.items():
             if len(group) < 2:
                 continue  # Skip singleton groups
             
-            theme = self._create_theme(
-                group=group,
-                theme_type="root_cause",
-                theme_name=self._get_root_cause_name(dtype),
-                id_prefix=f"rc_{dtype}"
-            )
-            themes.append(theme)
+            groups.append((
+                np.array(group, dtype=np.intp),
+                _root_cause_name(dtype),
+                f"rc_{dtype}"
+            ))
         
-        return themes
+        return self._create_themes(decisions, scores, groups, "root_cause")
     
     def _group_by_metric(
         self,
         decisions: List[Dict[str, Any]],
+        scores: np.ndarray,
+        decision_index: List[Dict[str, Any]],
         gaps: List[Dict[str, Any]] = None
     ) -> List[DecisionTheme]:
         """Group decisions by affected metrics."""
-        themes = []
-        
         if not gaps:
-            return themes
+            return []
         
-        # Build decision-to-metric mapping
-        metric_decisions: Dict[str, List[Dict]] = defaultdict(list)
+        # Build metric-to-decision-index mapping
+        metric_decisions: Dict[str, List[int]] = defaultdict(list)
         
         # Extract metrics from gap data
         gap_metrics = set()
@@ -141,64 +349,58 @@ class DecisionGroupingEngine:
             if metric:
                 gap_metrics.add(metric)
         
+        # Split metric names into match words once, not once per decision
+        metric_words = {
+            metric: [word for word in set(metric.split("_")) if len(word) > 2]
+            for metric in gap_metrics
+        }
+        
         # Group decisions that mention similar metrics in their summary
-        for d in decisions:
-            summary = d.get("summary", "").lower()
-            reasoning = d.get("reasoning", "").lower()
+        for idx, normalized in enumerate(decision_index):
+            summary = normalized["lower_summary"]
+            reasoning = normalized["lower_reasoning"]
             
             matched_metrics = set()
-            for metric in gap_metrics:
-                metric_words = set(metric.split("_"))
-                if any(word in summary or word in reasoning for word in metric_words if len(word) > 2):
+            for metric, words in metric_words.items():
+                if any(word in summary or word in reasoning for word in words):
                     matched_metrics.add(metric)
             
             # Also extract metrics from evidence
-            evidence = d.get("evidence", {}).get("supporting_evidence", [])
-            for ev in evidence:
-                if ev.get("type") == "gap":
-                    m = ev.get("metric", "")
-                    if m:
-                        matched_metrics.add(m.lower())
+            matched_metrics |= normalized["evidence_metrics"]
             
             for metric in matched_metrics:
-                metric_decisions[metric].append(d)
+                metric_decisions[metric].append(idx)
         
         # Create themes for metrics with multiple decisions
+        groups = []
         for metric, group in metric_decisions.items():
             if len(group) < 2:
                 continue
             
             # Deduplicate by decision id
-            seen_ids = set()
-            unique_group = []
-            for d in group:
-                if d.get("id") not in seen_ids:
-                    seen_ids.add(d.get("id"))
-                    unique_group.append(d)
+            unique_group = self._unique_by_id(decisions, group)
             
             if len(unique_group) < 2:
                 continue
             
-            theme = self._create_theme(
-                group=unique_group,
-                theme_type="metric",
-                theme_name=self._format_metric_name(metric),
-                id_prefix=f"metric_{metric[:20]}"
-            )
-            themes.append(theme)
+            groups.append((
+                np.array(unique_group, dtype=np.intp),
+                _format_metric_name(metric),
+                f"metric_{metric[:20]}"
+            ))
         
-        return themes
+        return self._create_themes(decisions, scores, groups, "metric")
     
     def _group_by_entity_cluster(
         self,
         decisions: List[Dict[str, Any]],
+        scores: np.ndarray,
+        decision_index: List[Dict[str, Any]],
         entities: List[Dict[str, Any]] = None
     ) -> List[DecisionTheme]:
         """Group decisions by entity clusters."""
-        themes = []
-        
         if not entities:
-            return themes
+            return []
         
         # Build entity name set
         entity_names = set()
@@ -207,99 +409,151 @@ class DecisionGroupingEngine:
             if name:
                 entity_names.add(name)
         
-        # Group decisions by mentioned entities
-        entity_decisions: Dict[str, List[Dict]] = defaultdict(list)
+        # One multi-pattern scan per text instead of one search per entity
+        matcher = _NameMatcher(entity_names)
+        name_order = {name: i for i, name in enumerate(entity_names)}
         
-        for d in decisions:
-            summary = d.get("summary", "")
-            
-            for entity_name in entity_names:
-                # Check if entity is mentioned
-                if entity_name.lower() in summary.lower():
-                    entity_decisions[entity_name].append(d)
+        # Group decision indices by mentioned entities
+        entity_decisions: Dict[str, List[int]] = defaultdict(list)
+        
+        for idx, normalized in enumerate(decision_index):
+            # Check if entity is mentioned
+            mentioned = matcher.find_all(normalized["lower_summary"])
+            for entity_name in sorted(mentioned, key=name_order.__getitem__):
+                entity_decisions[entity_name].append(idx)
             
-            # Also check evidence
-            evidence = d.get("evidence", {}).get("supporting_evidence", [])
-            for ev in evidence:
-                entity = ev.get("entity", "")
-                if entity:
-                    entity_lower = entity.lower()
-                    for ename in entity_names:
-                        if ename in entity_lower or entity_lower in ename:
-                            entity_decisions[ename].append(d)
+            # Also check evidence (containment either way, or a near-miss spelling)
+            for entity_lower in normalized["evidence_entities"]:
+                matched = matcher.find_all(entity_lower)
+                for ename in entity_names:
+                    if ename in matched or entity_lower in ename:
+                        entity_decisions[ename].append(idx)
+                        continue
+                    
+                    tol = max(1, len(ename) // 10)
+                    if _bounded_levenshtein(ename, entity_lower, tol) <= tol:
+                        entity_decisions[ename].append(idx)
         
         # Create themes for entities with multiple decisions
+        groups = []
         for entity, group in entity_decisions.items():
             if len(group) < 2:
                 continue
             
             # Deduplicate
-            seen_ids = set()
-            unique_group = []
-            for d in group:
-                if d.get("id") not in seen_ids:
-                    seen_ids.add(d.get("id"))
-                    unique_group.append(d)
+            unique_group = self._unique_by_id(decisions, group)
             
             if len(unique_group) < 2:
                 continue
             
-            theme = self._create_theme(
-                group=unique_group,
-                theme_type="entity_cluster",
-                theme_name=f"{entity.title()} Portfolio",
-                id_prefix=f"entity_{entity[:20]}"
+            groups.append((
+                np.array(unique_group, dtype=np.intp),
+                f"{entity.title()} Portfolio",
+                f"entity_{entity[:20]}"
+            ))
+        
+        return self._create_themes(decisions, scores, groups, "entity_cluster")
+    
+    def _create_themes(
+        self,
+        decisions: List[Dict[str, Any]],
+        scores: np.ndarray,
+        groups: List[Tuple[np.ndarray, str, str]],
+        theme_type: str
+    ) -> List[DecisionTheme]:
+        """Create themes for a batch of (group, theme_name, id_prefix) tuples."""
+        if not groups:
+            return []
+        
+        aggregates = self._aggregate_groups(scores, [group for group, _, _ in groups])
+        lengths = np.array([len(group) for group, _, _ in groups])
+        severities = self._calculate_theme_severities(
+            aggregates[:, 0] / lengths, aggregates[:, 2]
+        )
+        
+        return [
+            self._create_theme(
+                decisions=decisions,
+                scores=scores,
+                group=group,
+                aggregates=aggregates[k],
+                severity=severities[k],
+                theme_type=theme_type,
+                theme_name=theme_name,
+                id_prefix=id_prefix
             )
-            themes.append(theme)
+            for k, (group, theme_name, id_prefix) in enumerate(groups)
+        ]
+    
+    def _aggregate_groups(
+        self,
+        scores: np.ndarray,
+        groups: List[np.ndarray]
+    ) -> np.ndarray:
+        """Compute per-group (total_impact, avg_confidence, max_urgency).
+        
+        All groups are concatenated into one index array and reduced with
+        segmented ``reduceat`` calls, so the cost is a constant number of
+        NumPy calls per grouping pass instead of one slice per theme.
+        Groups must be non-empty.
+        """
+        lengths = np.array([len(group) for group in groups])
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        stacked = scores[np.concatenate(groups)]
         
-        return themes
+        sums = np.add.reduceat(stacked[:, :2], starts, axis=0)
+        max_urgency = np.maximum.reduceat(stacked[:, 2], starts)
+        
+        return np.column_stack((sums[:, 0], sums[:, 1] / lengths, max_urgency))
     
     def _create_theme(
         self,
-        group: List[Dict[str, Any]],
+        decisions: List[Dict[str, Any]],
+        scores: np.ndarray,
+        group: np.ndarray,
+        aggregates: np.ndarray,
+        severity: str,
         theme_type: str,
         theme_name: str,
         id_prefix: str
     ) -> DecisionTheme:
-        """Create a theme from a group of decisions."""
-        import hashlib
-        
-        # Generate unique ID
-        decision_ids = [d.get("id", "") for d in group]
-        id_hash = hashlib.md5("".join(sorted(decision_ids)).encode()).hexdigest()[:8]
-        theme_id = f"{id_prefix}_{id_hash}"
+        """Create a theme from a group of decision indices.
         
-        # Calculate aggregate metrics
-        total_impact = sum(d.get("impact_score", 0) for d in group)
-        avg_confidence = sum(d.get("confidence_score", 0) for d in group) / len(group) if group else 0
-        max_urgency = max(d.get("urgency_score", 0) for d in group) if group else 0
+        Args:
+            decisions: Full list of raw decisions
+            scores: (N, 3) impact/confidence/urgency matrix aligned with decisions
+            group: Indices into ``decisions`` belonging to this theme
+            aggregates: (total_impact, avg_confidence, max_urgency) for the group
+            severity: Theme severity computed for the batch
+            theme_type: Theme type
+            theme_name: Display name
+            id_prefix: Prefix for the theme ID
+        """
+        group_decisions = [decisions[i] for i in group]
         
-        # Collect affected entities and metrics
-        affected_entities = set()
-        affected_metrics = set()
+        # Generate unique ID
+        decision_ids = [d.get("id", "") for d in group_decisions]
+        id_hash = hashlib.blake2b(digest_size=4)
+        for decision_id in sorted(decision_ids):
+            id_hash.update(decision_id.encode())
+        theme_id = f"{id_prefix}_{id_hash.hexdigest()}"
         
-        for d in group:
-            summary = d.get("summary", "")
-            # Extract entities from summary (simplified)
-            words = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', summary)
-            affected_entities.update(words[:3])
-            
-            evidence = d.get("evidence", {}).get("supporting_evidence", [])
-            for ev in evidence:
-                if ev.get("entity"):
-                    affected_entities.add(str(ev.get("entity"))[:30])
-                if ev.get("metric"):
-                    affected_metrics.add(str(ev.get("metric")))
+        # Aggregate metrics were computed for the whole batch
+        total_impact, avg_confidence, max_urgency = (float(v) for v in aggregates)
         
-        # Determine severity
-        severity = self._calculate_theme_severity(total_impact / len(group), max_urgency)
+        # Collect affected entities and metrics, stopping once 10 are found
+        affected_entities = list(islice(_unique(self._iter_entity_mentions(group_decisions)), 10))
+        affected_metrics = list(islice(_unique(self._iter_metric_mentions(group_decisions)), 10))
         
         # Generate headline and summary
         headline = self._generate_theme_headline(theme_type, theme_name, len(group), severity)
         summary = self._generate_theme_summary(theme_type, theme_name, group, severity)
         
-        # Get representative decision (highest impact)
-        representative = max(group, key=lambda d: d.get("impact_score", 0))
+        # Get representative decision (highest impact, first on ties)
+        if len(group) < 8:
+            representative = max(group_decisions, key=lambda d: d.get("impact_score", 0))
+        else:
+            representative = decisions[group[int(scores[group, 0].argmax())]]
         
         return DecisionTheme(
             id=theme_id,
@@ -312,67 +566,81 @@ class DecisionGroupingEngine:
             avg_confidence=avg_confidence,
             max_urgency=max_urgency,
             severity=severity,
-            affected_entities=list(affected_entities)[:10],
-            affected_metrics=list(affected_metrics)[:10],
+            affected_entities=affected_entities,
+            affected_metrics=affected_metrics,
             decision_ids=decision_ids,
             representative_decision=representative,
             drill_down_available=True
         )
     
+    def _iter_entity_mentions(self, group_decisions: List[Dict[str, Any]]) -> Iterator[str]:
+        """Yield entity mentions from summaries and evidence, in decision order."""
+        for d in group_decisions:
+            # Extract entities from summary (simplified)
+            words = islice(_CAPPHRASE.finditer(d.get("summary", "")), 3)
+            for m in words:
+                yield m.group()
+            
+            evidence = d.get("evidence", {}).get("supporting_evidence", [])
+            for ev in evidence:
+                if ev.get("entity"):
+                    yield str(ev.get("entity"))[:30]
+    
+    def _iter_metric_mentions(self, group_decisions: List[Dict[str, Any]]) -> Iterator[str]:
+        """Yield metric names from evidence, in decision order."""
+        for d in group_decisions:
+            evidence = d.get("evidence", {}).get("supporting_evidence", [])
+            for ev in evidence:
+                if ev.get("metric"):
+                    yield str(ev.get("metric"))
+    
     def _merge_themes(
         self,
         *theme_lists: List[DecisionTheme]
     ) -> List[DecisionTheme]:
-        """Merge theme lists, removing duplicates."""
+        """Merge theme lists, removing duplicates.
+        
+        Accepted themes are indexed by decision ID, so a candidate is only
+        compared against themes it actually shares decisions with.
+        """
         all_themes = []
-        seen_decision_sets = set()
+        themes_by_decision: Dict[str, List[int]] = defaultdict(list)
         
         for themes in theme_lists:
             for theme in themes:
                 # Create a signature from decision IDs
                 decision_set = frozenset(theme.decision_ids)
                 
+                # Count shared decisions per previously accepted theme
+                shared_counts: Dict[int, int] = defaultdict(int)
+                for decision_id in decision_set:
+                    for theme_idx in themes_by_decision.get(decision_id, ()):
+                        shared_counts[theme_idx] += 1
+                
                 # Skip if we've seen very similar themes (>80% overlap)
-                is_duplicate = False
-                for seen_set in seen_decision_sets:
-                    overlap = len(decision_set & seen_set) / max(len(decision_set), 1)
-                    if overlap > 0.8:
-                        is_duplicate = True
-                        break
+                set_size = max(len(decision_set), 1)
+                is_duplicate = any(
+                    count / set_size > 0.8 for count in shared_counts.values()
+                )
                 
                 if not is_duplicate:
+                    theme_idx = len(all_themes)
                     all_themes.append(theme)
-                    seen_decision_sets.add(decision_set)
+                    for decision_id in decision_set:
+                        themes_by_decision[decision_id].append(theme_idx)
         
         return all_themes
     
-    def _get_root_cause_name(self, decision_type: str) -> str:
-        """Get human-readable root cause name."""
-        names = {
-            "investigate": "Performance Investigation Required",
-            "investigate_systemic": "Systemic Issues Detected",
-            "escalate": "Escalation Required",
-            "monitor": "Active Monitoring Needed",
-            "resolve": "Resolution Actions Pending",
-            "prioritize": "Prioritization Decisions",
-            "allocate": "Resource Allocation Issues",
-            "sequence": "Dependency Management",
-            "verify_targets": "Target Calibration Review"
-        }
-        return names.get(decision_type, decision_type.replace("_", " ").title())
-    
-    def _format_metric_name(self, metric: str) -> str:
-        """Format metric name for display."""
-        return metric.replace("_", " ").title()
-    
-    def _calculate_theme_severity(self, avg_impact: float, max_urgency: float) -> str:
-        """Calculate theme severity."""
+    def _calculate_theme_severities(
+        self,
+        avg_impact: np.ndarray,
+        max_urgency: np.ndarray
+    ) -> List[str]:
+        """Calculate severity for a batch of themes without per-theme branching."""
         score = (avg_impact + max_urgency) / 2
-        if score >= 0.7:
-            return "critical"
-        elif score >= 0.4:
-            return "warning"
-        return "normal"
+        codes = np.searchsorted(_SEVERITY_THRESHOLDS, score, side="right")
+        codes[np.isnan(score)] = 0  # NaN never clears a threshold
+        return _SEVERITY_LABELS[codes].tolist()
     
     def _generate_theme_headline(
         self,
@@ -394,7 +662,7 @@ class DecisionGroupingEngine:
         self,
         theme_type: str,
         theme_name: str,
-        group: List[Dict],
+        group: np.ndarray,
         severity: str
     ) -> str:
         """Generate theme summary."""
@@ -8,21 +8,22 @@ Detects entities by structural patterns:
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Set, Tuple, Any, Optional
+from typing import Dict, FrozenSet, List, Set, Tuple, Any, Optional
 from collections import defaultdict
 from dataclasses import dataclass
 import re
+import sys
 
 from .ontology import Entity, ColumnSemanticType
 from .sheet_classifier import SheetProfile
 
 
-@dataclass
+@dataclass(slots=True)
 class EntityCandidate:
     """A potential entity detected from column analysis."""
     column_name: str
     sheet_name: str
-    unique_values: Set[str]
+    unique_values: FrozenSet[str]
     cardinality: int
     unique_ratio: float
     value_pattern: str  # regex-like pattern of values
@@ -30,13 +31,35 @@ class EntityCandidate:
     is_numeric_id: bool
 
 
+@dataclass
+class CandidateTable:
+    """Column-oriented (SoA) view of entity candidates for pairwise scoring."""
+    cardinality: np.ndarray  # int64, one per candidate
+    avg_length: np.ndarray   # float64, one per candidate
+    pattern: np.ndarray      # small int code per value_pattern
+    values: List[FrozenSet[str]]
+    
+    @classmethod
+    def from_candidates(cls, candidates: List[EntityCandidate]) -> 'CandidateTable':
+        """Build the table from a list of candidates (row order preserved)."""
+        _, pattern_codes = np.unique(
+            [c.value_pattern for c in candidates], return_inverse=True
+        )
+        return cls(
+            cardinality=np.array([c.cardinality for c in candidates], dtype=np.int64),
+            avg_length=np.array([c.avg_length for c in candidates], dtype=np.float64),
+            pattern=pattern_codes.astype(np.int8).ravel(),
+            values=[c.unique_values for c in candidates]
+        )
+
+
 class EntityDetector:
     """Detect and link entities across sheets."""
     
     def __init__(self):
         self.entities: Dict[str, Entity] = {}
         self.column_to_entity: Dict[Tuple[str, str], str] = {}  # (sheet, col) -> entity_id
-        self.value_index: Dict[str, Set[str]] = {}  # value -> set of entity_ids
+        self.value_index: Dict[str, Set[str]] = defaultdict(set)  # value -> set of entity_ids
     
     def detect_entities(
         self,
@@ -104,18 +127,23 @@ class EntityDetector:
         ]:
             return True
         
+        # High uniqueness ratio for other types
+        unique_ratio = col_profile.get('unique_ratio', 0)
+        if semantic_type != ColumnSemanticType.DIMENSION and unique_ratio <= 0.7:
+            return False
+        
+        # Prefer the counts already computed during sheet profiling
+        unique_count = col_profile.get('unique_count')
+        if unique_count is None:
+            unique_count = series.nunique()
+        
         # Dimension with reasonable cardinality
         if semantic_type == ColumnSemanticType.DIMENSION:
-            unique_count = series.nunique()
-            if 2 <= unique_count <= len(series) * 0.8:
+            row_count = col_profile.get('row_count', len(series))
+            if 2 <= unique_count <= row_count * 0.8:
                 return True
         
-        # High uniqueness ratio for other types
-        unique_ratio = col_profile.get('unique_ratio', 0)
-        if unique_ratio > 0.7 and series.nunique() >= 2:
-            return True
-        
-        return False
+        return unique_ratio > 0.7 and unique_count >= 2
     
     def _create_candidate(
         self,
@@ -131,7 +159,7 @@ class EntityDetector:
         
         # Convert to strings for analysis
         str_values = non_null.astype(str)
-        unique_values = set(str_values.unique())
+        unique_values = frozenset(str_values.unique())
         
         # Skip if too few unique values
         if len(unique_values) < 2:
@@ -144,6 +172,12 @@ class EntityDetector:
         is_numeric_id = pd.api.types.is_numeric_dtype(series) and \
                        series.nunique() / len(non_null) > 0.9
         
+        # Intern repeated names so candidates share one string object
+        if isinstance(col_name, str):
+            col_name = sys.intern(col_name)
+        if isinstance(sheet_name, str):
+            sheet_name = sys.intern(sheet_name)
+        
         return EntityCandidate(
             column_name=col_name,
             sheet_name=sheet_name,
@@ -185,44 +219,44 @@ class EntityDetector:
             return []
         
         # Build similarity matrix based on value overlap
-        n = len(candidates)
-        similarity = np.zeros((n, n))
-        
-        for i in range(n):
-            for j in range(i + 1, n):
-                sim = self._calculate_similarity(candidates[i], candidates[j])
-                similarity[i, j] = sim
-                similarity[j, i] = sim
+        table = CandidateTable.from_candidates(candidates)
+        similarity = self._calculate_similarity(table)
         
         # Group by similarity using simple clustering
         groups = self._cluster_candidates(candidates, similarity)
         
         return groups
     
-    def _calculate_similarity(
-        self,
-        c1: EntityCandidate,
-        c2: EntityCandidate
-    ) -> float:
-        """Calculate similarity between two candidates."""
-        # Value overlap (Jaccard similarity)
-        overlap = len(c1.unique_values & c2.unique_values)
-        union = len(c1.unique_values | c2.unique_values)
+    def _calculate_similarity(self, table: CandidateTable) -> np.ndarray:
+        """Calculate the pairwise similarity matrix for all candidates."""
+        n = len(table.values)
         
-        if union == 0:
-            return 0.0
-        
-        jaccard = overlap / union
+        # Value overlap (Jaccard similarity) - the only set-based term
+        jaccard = np.zeros((n, n))
+        for i in range(n):
+            values_i = table.values[i]
+            for j in range(i + 1, n):
+                overlap = len(values_i & table.values[j])
+                union = len(values_i) + len(table.values[j]) - overlap
+                if union:
+                    jaccard[i, j] = jaccard[j, i] = overlap / union
         
         # Pattern similarity
-        pattern_match = 1.0 if c1.value_pattern == c2.value_pattern else 0.3
+        pattern_match = np.where(
+            table.pattern[:, None] == table.pattern[None, :], 1.0, 0.3
+        )
         
         # Cardinality similarity
-        card_ratio = min(c1.cardinality, c2.cardinality) / max(c1.cardinality, c2.cardinality)
+        card = table.cardinality
+        card_ratio = np.minimum.outer(card, card) / np.maximum.outer(card, card)
         
         # Length similarity
-        len_ratio = min(c1.avg_length, c2.avg_length) / max(c1.avg_length, c2.avg_length) \
-                   if max(c1.avg_length, c2.avg_length) > 0 else 0
+        length = table.avg_length
+        max_len = np.maximum.outer(length, length)
+        len_ratio = np.divide(
+            np.minimum.outer(length, length), max_len,
+            out=np.zeros((n, n)), where=max_len > 0
+        )
         
         # Weighted combination
         similarity = (
@@ -231,6 +265,7 @@ class EntityDetector:
             0.15 * card_ratio +
             0.15 * len_ratio
         )
+        np.fill_diagonal(similarity, 0.0)
         
         return similarity
     
@@ -240,26 +275,26 @@ class EntityDetector:
         similarity: np.ndarray,
         threshold: float = 0.3
     ) -> List[List[EntityCandidate]]:
-        """Cluster candidates by similarity."""
-        n = len(candidates)
-        visited = [False] * n
+        """Cluster candidates by similarity.
+        
+        Each unvisited seed claims every still-unvisited candidate scoring at
+        or above ``threshold`` against it. Only the shrinking array of
+        unvisited indices is scanned, with one vectorized comparison per seed.
+        """
+        unvisited = np.arange(len(candidates))
         groups = []
         
-        for i in range(n):
-            if visited[i]:
-                continue
-            
-            # Start new group
-            group = [candidates[i]]
-            visited[i] = True
-            
-            # Find similar candidates
-            for j in range(n):
-                if not visited[j] and similarity[i, j] >= threshold:
-                    group.append(candidates[j])
-                    visited[j] = True
+        while unvisited.size:
+            # Start new group from the first unvisited candidate
+            i = unvisited[0]
+            rest = unvisited[1:]
             
+            # Find similar candidates among the unvisited ones
+            similar = similarity[i, rest] >= threshold
+            group = [candidates[i]] + [candidates[j] for j in rest[similar]]
             groups.append(group)
+            
+            unvisited = rest[~similar]
         
         return groups
     
@@ -304,11 +339,11 @@ class EntityDetector:
             for c in group:
                 self.column_to_entity[(c.sheet_name, c.column_name)] = entity.id
             
-            # Update value index
+            # Update value index (one hashed lookup per value)
+            value_index = self.value_index
+            entity_id = entity.id
             for value in all_values:
-                if value not in self.value_index:
-                    self.value_index[value] = set()
-                self.value_index[value].add(entity.id)
+                value_index[value].add(entity_id)
         
         return entities
     
@@ -6,9 +6,12 @@ Uses structural patterns to identify:
 - Target vs Result mismatches
 """
 
+import os
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Any, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Any
 from dataclasses import dataclass
 
 from .ontology import Gap, Plan, Actual, Entity
@@ -16,6 +19,14 @@ from .sheet_classifier import SheetProfile, SheetRole
 from .entity_detector import EntityDetector
 
 
+# Severity labels indexed by severity level
+_SEVERITY_LABELS = np.array(["normal", "warning", "critical"])
+
+# Level boundaries for |percentage gap| and for |difference| z-scores
+_PERCENT_THRESHOLDS = np.array([5.0, 15.0])
+_ZSCORE_THRESHOLDS = np.array([1.0, 2.0])
+
+
 @dataclass
 class ColumnPair:
     """A detected plan-actual column pair."""
@@ -29,11 +40,22 @@ class ColumnPair:
 class GapAnalyzer:
     """Analyze gaps between planned and actual values."""
     
+    # Sheet pairs are analyzed on a thread pool past both limits
+    PARALLEL_MIN_PAIRS = 4
+    PARALLEL_MIN_ROWS = 100_000
+    
+    # Correlations are computed in float32 past this many rows
+    FLOAT32_CORR_MIN_ROWS = 10_000
+    
     def __init__(self):
         self.gaps: List[Gap] = []
+        self._gaps_by_entity: Dict[str, List[Gap]] = defaultdict(list)
+        self._gaps_by_severity: Dict[str, List[Gap]] = defaultdict(list)
         self.plans: List[Plan] = []
         self.actuals: List[Actual] = []
         self.column_pairs: List[ColumnPair] = []
+        self._entity_id_cache: Dict[str, str] = {}
+        self._numeric_columns: Dict[str, List[Any]] = {}
     
     def analyze_gaps(
         self,
@@ -53,6 +75,15 @@ class GapAnalyzer:
         Returns:
             Tuple of (gaps, plans, actuals)
         """
+        # Entity values resolve against this run's detector only
+        self._entity_id_cache.clear()
+        
+        # Numeric columns per sheet, shared by every strategy
+        self._numeric_columns = {
+            name: df.select_dtypes(include=[np.number]).columns.tolist()
+            for name, df in datasets.items()
+        }
+        
         # Strategy 1: Find explicit plan/actual sheets
         self._analyze_separate_sheets(datasets, entities, entity_detector, sheet_profiles)
         
@@ -81,35 +112,92 @@ class GapAnalyzer:
             if profile.inferred_role in [SheetRole.ACTUAL, SheetRole.TRANSACTIONAL]
         ]
         
-        for plan_sheet in plan_sheets:
-            plan_df = datasets.get(plan_sheet)
-            if plan_df is None:
-                continue
+        sheet_pairs = [
+            (plan_sheet, actual_sheet)
+            for plan_sheet in plan_sheets if datasets.get(plan_sheet) is not None
+            for actual_sheet in actual_sheets if datasets.get(actual_sheet) is not None
+        ]
+        
+        def analyze_pair(pair: Tuple[str, str]):
+            plan_sheet, actual_sheet = pair
+            return self._gaps_for_sheet_pair(
+                datasets[plan_sheet], datasets[actual_sheet],
+                plan_sheet, actual_sheet,
+                entities, entity_detector
+            )
+        
+        total_rows = sum(
+            len(datasets[plan_sheet]) + len(datasets[actual_sheet])
+            for plan_sheet, actual_sheet in sheet_pairs
+        )
+        
+        # Pairs are independent; merges and array math release the GIL
+        if (len(sheet_pairs) > self.PARALLEL_MIN_PAIRS
+                and total_rows > self.PARALLEL_MIN_ROWS):
+            workers = min(len(sheet_pairs), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(analyze_pair, sheet_pairs))
+        else:
+            results = [analyze_pair(pair) for pair in sheet_pairs]
+        
+        for gaps, plans, actuals in results:
+            self._record_gaps(gaps)
+            self.plans.extend(plans)
+            self.actuals.extend(actuals)
+    
+    def _gaps_for_sheet_pair(
+        self,
+        plan_df: pd.DataFrame,
+        actual_df: pd.DataFrame,
+        plan_sheet: str,
+        actual_sheet: str,
+        entities: Dict[str, Entity],
+        entity_detector: EntityDetector
+    ) -> Tuple[List[Gap], List[Plan], List[Actual]]:
+        """Collect gaps between one plan sheet and one actual sheet.
+        
+        Does not touch the analyzer's result lists, so pairs can be
+        processed concurrently.
+        
+        Args:
+            plan_df: Plan sheet data
+            actual_df: Actual sheet data
+            plan_sheet: Plan sheet name
+            actual_sheet: Actual sheet name
+            entities: Detected entities
+            entity_detector: Entity detector
             
-            for actual_sheet in actual_sheets:
-                actual_df = datasets.get(actual_sheet)
-                if actual_df is None:
-                    continue
-                
-                # Find common entity columns
-                common_entities = self._find_common_entities(
-                    plan_df, actual_df, plan_sheet, actual_sheet, entity_detector
+        Returns:
+            Tuple of (gaps, plans, actuals)
+        """
+        gaps, plans, actuals = [], [], []
+        
+        # Find common entity columns
+        common_entities = self._find_common_entities(
+            plan_df, actual_df, plan_sheet, actual_sheet, entity_detector
+        )
+        
+        if not common_entities:
+            return gaps, plans, actuals
+        
+        # Find comparable metric columns
+        metric_pairs = self._match_metric_columns(
+            plan_df, actual_df, plan_sheet, actual_sheet
+        )
+        
+        for entity_col in common_entities:
+            for plan_metric, actual_metric in metric_pairs:
+                pair_gaps, pair_plans, pair_actuals = self._extract_gaps_from_sheets(
+                    plan_df, actual_df,
+                    entity_col, plan_metric, actual_metric,
+                    plan_sheet, actual_sheet,
+                    entities, entity_detector
                 )
-                
-                if not common_entities:
-                    continue
-                
-                # Find comparable metric columns
-                metric_pairs = self._match_metric_columns(plan_df, actual_df)
-                
-                for entity_col in common_entities:
-                    for plan_metric, actual_metric in metric_pairs:
-                        self._extract_gaps_from_sheets(
-                            plan_df, actual_df,
-                            entity_col, plan_metric, actual_metric,
-                            plan_sheet, actual_sheet,
-                            entities, entity_detector
-                        )
+                gaps.extend(pair_gaps)
+                plans.extend(pair_plans)
+                actuals.extend(pair_actuals)
+        
+        return gaps, plans, actuals
     
     def _analyze_column_pairs(
         self,
@@ -125,7 +213,7 @@ class GapAnalyzer:
                 continue
             
             # Get numeric columns
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+            numeric_cols = self._numeric_columns[sheet_name]
             
             if len(numeric_cols) < 2:
                 continue
@@ -180,82 +268,98 @@ class GapAnalyzer:
         entity_detector: EntityDetector
     ) -> List[str]:
         """Find entity columns common to both dataframes."""
+        # Index entities of the second sheet once, then probe with the first
+        entity_ids2 = set()
+        for col2 in df2.columns:
+            entity2 = entity_detector.get_entity_for_column(sheet2, str(col2))
+            if entity2:
+                entity_ids2.add(entity2.id)
+        
         common = []
         
         for col1 in df1.columns:
             entity1 = entity_detector.get_entity_for_column(sheet1, str(col1))
-            if not entity1:
-                continue
-            
-            for col2 in df2.columns:
-                entity2 = entity_detector.get_entity_for_column(sheet2, str(col2))
-                if entity2 and entity1.id == entity2.id:
-                    common.append(str(col1))
-                    break
+            if entity1 and entity1.id in entity_ids2:
+                common.append(str(col1))
         
         return common
     
     def _match_metric_columns(
         self,
         plan_df: pd.DataFrame,
-        actual_df: pd.DataFrame
+        actual_df: pd.DataFrame,
+        plan_sheet: str,
+        actual_sheet: str
     ) -> List[Tuple[str, str]]:
         """Match metric columns between plan and actual sheets."""
-        plan_numeric = plan_df.select_dtypes(include=[np.number]).columns
-        actual_numeric = actual_df.select_dtypes(include=[np.number]).columns
+        plan_numeric = self._numeric_columns[plan_sheet]
+        actual_numeric = self._numeric_columns[actual_sheet]
+        
+        if len(plan_numeric) == 0 or len(actual_numeric) == 0:
+            return []
+        
+        # One statistics pass per sheet; rows are min, max, mean
+        plan_stats = self._column_stats(plan_df[plan_numeric])
+        actual_stats = self._column_stats(actual_df[actual_numeric])
+        
+        # Score every (plan, actual) pair based on statistical similarity
+        scores = self._similarity_matrix(plan_stats, actual_stats)
+        best = scores.argmax(axis=1)
         
         pairs = []
         
-        for plan_col in plan_numeric:
-            best_match = None
-            best_score = 0
-            
-            for actual_col in actual_numeric:
-                # Score based on statistical similarity
-                score = self._column_similarity_score(
-                    plan_df[plan_col], actual_df[actual_col]
-                )
-                
-                if score > best_score:
-                    best_score = score
-                    best_match = actual_col
-            
-            if best_match and best_score > 0.3:
-                pairs.append((str(plan_col), str(best_match)))
+        for i, plan_col in enumerate(plan_numeric):
+            if scores[i, best[i]] > 0.3:
+                pairs.append((str(plan_col), str(actual_numeric[best[i]])))
         
         return pairs
     
-    def _column_similarity_score(
+    def _column_stats(self, df: pd.DataFrame) -> np.ndarray:
+        """Get a (3, n_columns) array of per-column min, max and mean."""
+        return df.agg(['min', 'max', 'mean']).to_numpy(dtype=np.float64)
+    
+    def _similarity_matrix(
         self,
-        series1: pd.Series,
-        series2: pd.Series
-    ) -> float:
-        """Calculate similarity score between two numeric columns."""
-        s1 = series1.dropna()
-        s2 = series2.dropna()
-        
-        if s1.empty or s2.empty:
-            return 0.0
-        
-        # Compare ranges
-        range1 = s1.max() - s1.min()
-        range2 = s2.max() - s2.min()
-        
-        if range1 == 0 or range2 == 0:
-            return 0.0
-        
-        range_ratio = min(range1, range2) / max(range1, range2)
-        
-        # Compare means
-        mean1, mean2 = s1.mean(), s2.mean()
-        if mean1 == 0 and mean2 == 0:
-            mean_ratio = 1.0
-        elif mean1 == 0 or mean2 == 0:
-            mean_ratio = 0.0
-        else:
-            mean_ratio = min(abs(mean1), abs(mean2)) / max(abs(mean1), abs(mean2))
+        stats1: np.ndarray,
+        stats2: np.ndarray
+    ) -> np.ndarray:
+        """Calculate similarity scores between two sets of numeric columns.
+        
+        Args:
+            stats1: (3, n) min/max/mean of the first set of columns
+            stats2: (3, m) min/max/mean of the second set of columns
+            
+        Returns:
+            (n, m) score matrix; pairs that cannot be compared score 0
+        """
+        range1 = (stats1[1] - stats1[0])[:, None]
+        range2 = (stats2[1] - stats2[0])[None, :]
+        mean1 = np.abs(stats1[2])[:, None]
+        mean2 = np.abs(stats2[2])[None, :]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Compare ranges
+            scores = self._ratio_matrix(range1, range2)
+            
+            # Compare means
+            mean_ratio = self._ratio_matrix(mean1, mean2)
+        
+        mean_ratio[(mean1 == 0) & (mean2 == 0)] = 1.0
+        
+        # Equal weights; accumulate in place to avoid (n, m) temporaries
+        scores += mean_ratio
+        scores *= 0.5
         
-        return 0.5 * range_ratio + 0.5 * mean_ratio
+        # Empty (NaN stats) or constant columns are not comparable
+        scores[np.isnan(scores)] = 0.0
+        scores[(range1 == 0) | (range2 == 0)] = 0.0
+        return scores
+    
+    def _ratio_matrix(self, values1: np.ndarray, values2: np.ndarray) -> np.ndarray:
+        """Broadcast min(v1, v2) / max(v1, v2) over a column and a row vector."""
+        ratio = np.minimum(values1, values2)
+        ratio /= np.maximum(values1, values2)
+        return ratio
     
     def _detect_comparison_pairs(
         self,
@@ -263,38 +367,54 @@ class GapAnalyzer:
         numeric_cols: List[str]
     ) -> List[Tuple[str, str, float, float]]:
         """Detect column pairs that look like comparisons."""
+        var = df[numeric_cols].var().to_numpy()
+        
+        # Constant or empty columns can never pair; leave them out of the
+        # correlation matrix altogether
+        varying = np.flatnonzero(var > 0)
+        if len(varying) < 2:
+            return []
+        
+        candidates = [numeric_cols[i] for i in varying]
+        var = var[varying]
+        corr = self._correlation_matrix(df[candidates])
+        
+        # Scan each unordered pair once, in column order
+        rows, cols = np.triu_indices(len(candidates), k=1)
+        pair_corr = corr[rows, cols]
+        var1, var2 = var[rows], var[cols]
+        
+        # High correlation suggests comparison pair; plan often has less
+        # variance (smoother targets), so different variances suggest
+        # plan vs actual
+        var_ratio = np.minimum(var1, var2) / np.maximum(var1, var2)
+        mask = (pair_corr > 0.7) & (var_ratio < 0.8)
+        
         pairs = []
         
-        for i, col1 in enumerate(numeric_cols):
-            for col2 in numeric_cols[i+1:]:
-                # Calculate correlation
-                try:
-                    corr = df[col1].corr(df[col2])
-                    if pd.isna(corr):
-                        continue
-                except:
-                    continue
-                
-                # High correlation suggests comparison pair
-                if corr > 0.7:
-                    # Check if one could be plan, other actual
-                    # Plan often has less variance (smoother targets)
-                    var1 = df[col1].var()
-                    var2 = df[col2].var()
-                    
-                    if var1 > 0 and var2 > 0:
-                        var_ratio = min(var1, var2) / max(var1, var2)
-                        
-                        # Different variances suggest plan vs actual
-                        if var_ratio < 0.8:
-                            # Lower variance is likely plan
-                            if var1 < var2:
-                                pairs.append((col1, col2, corr, 0.7))
-                            else:
-                                pairs.append((col2, col1, corr, 0.7))
+        for i, j, c in zip(rows[mask], cols[mask], pair_corr[mask].tolist()):
+            # Lower variance is likely plan
+            if var[i] < var[j]:
+                pairs.append((candidates[i], candidates[j], c, 0.7))
+            else:
+                pairs.append((candidates[j], candidates[i], c, 0.7))
         
         return pairs
     
+    def _correlation_matrix(self, block: pd.DataFrame) -> np.ndarray:
+        """Calculate pairwise column correlations of a numeric block.
+        
+        Large gap-free blocks are correlated in float32, which halves memory
+        traffic; the precision loss is immaterial against the 0.7 pairing
+        threshold. Otherwise pandas handles missing values pairwise.
+        """
+        if len(block) > self.FLOAT32_CORR_MIN_ROWS:
+            values = block.to_numpy(dtype=np.float32)
+            if not np.isnan(values).any():
+                return np.corrcoef(values, rowvar=False, dtype=np.float32)
+        
+        return block.corr().to_numpy()
+    
     def _extract_gaps_from_sheets(
         self,
         plan_df: pd.DataFrame,
@@ -306,37 +426,33 @@ class GapAnalyzer:
         actual_sheet: str,
         entities: Dict[str, Entity],
         entity_detector: EntityDetector
-    ):
+    ) -> Tuple[List[Gap], List[Plan], List[Actual]]:
         """Extract gaps from separate plan and actual sheets."""
-        # Merge on entity column
+        # Merge on entity column; only entities present in both sheets can
+        # produce a gap. Keys stay sorted, as the outer merge returned them
         merged = pd.merge(
             plan_df[[entity_col, plan_metric]].rename(columns={plan_metric: 'plan'}),
             actual_df[[entity_col, actual_metric]].rename(columns={actual_metric: 'actual'}),
             on=entity_col,
-            how='outer'
+            how='inner',
+            sort=True
+        ).dropna(subset=['plan', 'actual'])
+        
+        if merged.empty:
+            return [], [], []
+        
+        # Box entity values in the frame-wide dtype, as row iteration did
+        row_dtype = merged.iloc[:0].to_numpy().dtype
+        entity_values = merged[entity_col].to_numpy(dtype=row_dtype)
+        
+        return self._create_gaps(
+            entity_vals=[str(v) for v in entity_values],
+            metric_name=plan_metric,
+            plan_values=merged['plan'].to_numpy(dtype=np.float64),
+            actual_values=merged['actual'].to_numpy(dtype=np.float64),
+            entity_detector=entity_detector,
+            plan_sheet=plan_sheet
         )
-        
-        for _, row in merged.iterrows():
-            plan_val = row.get('plan')
-            actual_val = row.get('actual')
-            entity_val = row.get(entity_col)
-            
-            if pd.isna(plan_val) or pd.isna(actual_val):
-                continue
-            
-            # Create gap
-            gap = self._create_gap(
-                entity_val=str(entity_val),
-                metric_name=plan_metric,
-                plan_value=float(plan_val),
-                actual_value=float(actual_val),
-                entity_detector=entity_detector,
-                entities=entities,
-                plan_sheet=plan_sheet
-            )
-            
-            if gap:
-                self.gaps.append(gap)
     
     def _extract_gaps_from_columns(
         self,
@@ -356,27 +472,32 @@ class GapAnalyzer:
                 entity_col = str(col)
                 break
         
-        for idx, row in df.iterrows():
-            plan_val = row.get(plan_col)
-            actual_val = row.get(actual_col)
-            
-            if pd.isna(plan_val) or pd.isna(actual_val):
-                continue
-            
-            entity_val = str(row.get(entity_col)) if entity_col else f"row_{idx}"
-            
-            gap = self._create_gap(
-                entity_val=entity_val,
-                metric_name=plan_col,
-                plan_value=float(plan_val),
-                actual_value=float(actual_val),
-                entity_detector=entity_detector,
-                entities=entities,
-                plan_sheet=sheet_name
-            )
-            
-            if gap:
-                self.gaps.append(gap)
+        plan_values = df[plan_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        actual_values = df[actual_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~(np.isnan(plan_values) | np.isnan(actual_values))
+        
+        if not valid.any():
+            return
+        
+        if entity_col:
+            # Box entity values in the frame-wide dtype, as row iteration did
+            row_dtype = df.iloc[:0].to_numpy().dtype
+            entity_values = df[entity_col].to_numpy(dtype=row_dtype)[valid]
+            entity_vals = [str(v) for v in entity_values]
+        else:
+            entity_vals = [f"row_{idx}" for idx in df.index[valid]]
+        
+        gaps, plans, actuals = self._create_gaps(
+            entity_vals=entity_vals,
+            metric_name=plan_col,
+            plan_values=plan_values[valid],
+            actual_values=actual_values[valid],
+            entity_detector=entity_detector,
+            plan_sheet=sheet_name
+        )
+        self._record_gaps(gaps)
+        self.plans.extend(plans)
+        self.actuals.extend(actuals)
     
     def _analyze_difference_columns(
         self,
@@ -386,143 +507,185 @@ class GapAnalyzer:
         entity_detector: EntityDetector
     ):
         """Analyze columns that contain pre-computed differences."""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        numeric_cols = self._numeric_columns[sheet_name]
+        
+        # Entity column for row labels is the same for every column
+        entity_col = None
+        for c in df.columns:
+            entity = entity_detector.get_entity_for_column(sheet_name, str(c))
+            if entity:
+                entity_col = str(c)
+                break
+        entity_values = df[entity_col].to_numpy(dtype=object) if entity_col else None
         
         for col in numeric_cols:
-            series = df[col].dropna()
+            present = df[col].notna().to_numpy()
+            series = df[col][present]
             
             # Check if this column contains differences (has negatives, centered around 0)
             if series.empty:
                 continue
             
+            std = series.std()
             has_negatives = (series < 0).any()
-            near_zero_mean = abs(series.mean()) < series.std() * 0.5 if series.std() > 0 else False
+            near_zero_mean = abs(series.mean()) < std * 0.5 if std > 0 else False
+            
+            if not (has_negatives and near_zero_mean):
+                continue
             
-            if has_negatives and near_zero_mean:
-                # This looks like a difference/variance column
-                # Create gaps from non-zero values
-                for idx, val in series.items():
-                    if abs(val) > 0.01:  # Non-trivial difference
-                        # Find entity for this row
-                        entity_col = None
-                        for c in df.columns:
-                            entity = entity_detector.get_entity_for_column(sheet_name, str(c))
-                            if entity:
-                                entity_col = str(c)
-                                break
-                        
-                        entity_val = str(df.loc[idx, entity_col]) if entity_col else f"row_{idx}"
-                        
-                        gap = Gap(
-                            entity_id=entity_val,
-                            metric_name=str(col),
-                            plan_value=None,  # Unknown from difference alone
-                            actual_value=None,
-                            absolute_gap=float(val),
-                            percentage_gap=0.0,  # Can't calculate without base
-                            direction="under" if val < 0 else "over",
-                            severity=self._calculate_severity_from_diff(val, series)
-                        )
-                        self.gaps.append(gap)
+            # This looks like a difference/variance column
+            # Create gaps from non-zero values
+            diffs = series.to_numpy(dtype=np.float64)
+            significant = np.abs(diffs) > 0.01  # Non-trivial difference
+            diffs = diffs[significant]
+            
+            if entity_values is not None:
+                labels = [str(v) for v in entity_values[present][significant]]
+            else:
+                labels = [f"row_{idx}" for idx in series.index[significant]]
+            
+            severities = self._calculate_severities_from_diff(diffs, std)
+            
+            self._record_gaps([
+                Gap(
+                    entity_id=entity_val,
+                    metric_name=str(col),
+                    plan_value=None,  # Unknown from difference alone
+                    actual_value=None,
+                    absolute_gap=val,
+                    percentage_gap=0.0,  # Can't calculate without base
+                    direction="under" if val < 0 else "over",
+                    severity=severity
+                )
+                for entity_val, val, severity in zip(
+                    labels, diffs.tolist(), severities.tolist()
+                )
+            ])
     
-    def _create_gap(
+    def _record_gaps(self, gaps: List[Gap]):
+        """Append gaps and index them by entity and severity."""
+        self.gaps.extend(gaps)
+        for gap in gaps:
+            self._gaps_by_entity[gap.entity_id].append(gap)
+            self._gaps_by_severity[gap.severity].append(gap)
+    
+    def _create_gaps(
         self,
-        entity_val: str,
+        entity_vals: List[str],
         metric_name: str,
-        plan_value: float,
-        actual_value: float,
+        plan_values: np.ndarray,
+        actual_values: np.ndarray,
         entity_detector: EntityDetector,
-        entities: Dict[str, Entity],
         plan_sheet: str
-    ) -> Optional[Gap]:
-        """Create a Gap object from plan and actual values."""
-        absolute_gap = actual_value - plan_value
+    ) -> Tuple[List[Gap], List[Plan], List[Actual]]:
+        """Create Gap objects for aligned arrays of plan and actual values.
         
-        if plan_value != 0:
-            percentage_gap = (absolute_gap / plan_value) * 100
-        else:
-            percentage_gap = 100.0 if actual_value != 0 else 0.0
+        Gap, percentage, direction and severity are computed over whole
+        arrays before objects are built. A Plan and an Actual are returned
+        with every gap.
         
-        # Determine direction
-        if abs(percentage_gap) < 5:
-            direction = "on_target"
-        elif actual_value < plan_value:
-            direction = "under"
-        else:
-            direction = "over"
-        
-        # Determine severity
-        severity = self._calculate_severity(percentage_gap)
-        
-        # Find entity ID
-        entity_id = entity_val
-        matches = entity_detector.find_entities_by_value(entity_val)
-        if matches:
-            entity_id = matches[0].id
-        
-        # Record plan and actual
-        plan = Plan(
-            entity_id=entity_id,
-            metric_name=metric_name,
-            target_value=plan_value,
-            source_sheet=plan_sheet,
-            confidence=0.8
-        )
-        self.plans.append(plan)
+        Args:
+            entity_vals: Entity value per row
+            metric_name: Metric being compared
+            plan_values: Planned values (float64)
+            actual_values: Actual values (float64)
+            entity_detector: Entity detector
+            plan_sheet: Sheet the plan values came from
+            
+        Returns:
+            Tuple of (gaps, plans, actuals), one of each per row
+        """
+        absolute_gap = actual_values - plan_values
         
-        actual = Actual(
-            entity_id=entity_id,
-            metric_name=metric_name,
-            actual_value=actual_value,
-            confidence=0.8
-        )
-        self.actuals.append(actual)
-        
-        return Gap(
-            entity_id=entity_id,
-            metric_name=metric_name,
-            plan_value=plan_value,
-            actual_value=actual_value,
-            absolute_gap=absolute_gap,
-            percentage_gap=percentage_gap,
-            direction=direction,
-            severity=severity
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentage_gap = np.where(
+                plan_values != 0,
+                (absolute_gap / plan_values) * 100,
+                np.where(actual_values != 0, 100.0, 0.0)
+            )
+        
+        # Severity level also decides direction: level 0 is on target
+        levels = self._severity_levels(percentage_gap)
+        severity = _SEVERITY_LABELS[levels]
+        direction = np.where(
+            levels == 0, "on_target",
+            np.where(actual_values < plan_values, "under", "over")
         )
+        
+        # Resolve each distinct entity value once for the whole batch
+        entity_ids = {
+            entity_val: self._resolve_entity_id(entity_val, entity_detector)
+            for entity_val in set(entity_vals)
+        }
+        
+        gaps, plans, actuals = [], [], []
+        for entity_val, plan_value, actual_value, gap_value, pct, dir_, sev in zip(
+            entity_vals, plan_values.tolist(), actual_values.tolist(),
+            absolute_gap.tolist(), percentage_gap.tolist(),
+            direction.tolist(), severity.tolist()
+        ):
+            entity_id = entity_ids[entity_val]
+            
+            # Record plan and actual
+            plans.append(Plan(
+                entity_id=entity_id,
+                metric_name=metric_name,
+                target_value=plan_value,
+                source_sheet=plan_sheet,
+                confidence=0.8
+            ))
+            actuals.append(Actual(
+                entity_id=entity_id,
+                metric_name=metric_name,
+                actual_value=actual_value,
+                confidence=0.8
+            ))
+            
+            gaps.append(Gap(
+                entity_id=entity_id,
+                metric_name=metric_name,
+                plan_value=plan_value,
+                actual_value=actual_value,
+                absolute_gap=gap_value,
+                percentage_gap=pct,
+                direction=dir_,
+                severity=sev
+            ))
+        
+        return gaps, plans, actuals
     
-    def _calculate_severity(self, percentage_gap: float) -> str:
-        """Calculate severity based on percentage gap."""
-        abs_gap = abs(percentage_gap)
-        
-        if abs_gap < 5:
-            return "normal"
-        elif abs_gap < 15:
-            return "warning"
-        else:
-            return "critical"
-    
-    def _calculate_severity_from_diff(
-        self, 
-        diff_value: float, 
-        all_diffs: pd.Series
+    def _resolve_entity_id(
+        self,
+        entity_val: str,
+        entity_detector: EntityDetector
     ) -> str:
-        """Calculate severity based on difference value relative to distribution."""
-        std = all_diffs.std()
+        """Find the entity ID for a value, falling back to the value itself."""
+        entity_id = self._entity_id_cache.get(entity_val)
+        if entity_id is None:
+            matches = entity_detector.find_entities_by_value(entity_val)
+            entity_id = matches[0].id if matches else entity_val
+            self._entity_id_cache[entity_val] = entity_id
+        return entity_id
+    
+    def _severity_levels(self, percentage_gaps: np.ndarray) -> np.ndarray:
+        """Classify percentage gaps as 0 (normal), 1 (warning) or 2 (critical)."""
+        return np.digitize(np.abs(percentage_gaps), _PERCENT_THRESHOLDS)
+    
+    def _calculate_severities_from_diff(
+        self,
+        diffs: np.ndarray,
+        std: float
+    ) -> np.ndarray:
+        """Calculate severities for difference values relative to their distribution."""
         if std == 0:
-            return "normal"
+            return np.full(len(diffs), "normal")
         
-        z_score = abs(diff_value) / std
-        
-        if z_score < 1:
-            return "normal"
-        elif z_score < 2:
-            return "warning"
-        else:
-            return "critical"
+        return _SEVERITY_LABELS[np.digitize(np.abs(diffs) / std, _ZSCORE_THRESHOLDS)]
     
     def get_critical_gaps(self) -> List[Gap]:
         """Get all critical severity gaps."""
-        return [g for g in self.gaps if g.severity == "critical"]
+        return list(self._gaps_by_severity.get("critical", []))
     
     def get_gaps_by_entity(self, entity_id: str) -> List[Gap]:
         """Get all gaps for a specific entity."""
-        return [g for g in self.gaps if g.entity_id == entity_id]
+        return list(self._gaps_by_entity.get(entity_id, []))
@@ -1,18 +1,173 @@
 """Data ingestion module for multiple file formats."""
 
 import pandas as pd
-from typing import Optional, Dict, Any, List, Tuple, Union, BinaryIO
+from typing import Optional, Dict, Any, List, Union, BinaryIO, Callable, Iterator, Mapping
 import os
 import json
+import asyncio
+import codecs
+import hashlib
+import mmap
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from io import BytesIO
 
 
+# Container types produced by json.loads
+_JSON_CONTAINERS = (dict, list)
+
+# Bytes decoded per step when probing text encodings
+DECODE_WINDOW = 1024 * 1024  # 1MB
+
+
+@lru_cache(maxsize=256)
+def _suffix(filename: str) -> str:
+    """Lower-cased extension of a filename, memoized for repeated names."""
+    return Path(filename).suffix.lower()
+
+
+def is_utf8(data: Union[bytes, mmap.mmap]) -> bool:
+    """Check whether a buffer holds valid UTF-8 text.
+    
+    Args:
+        data: File content as bytes or a memory map
+        
+    Returns:
+        True if the content decodes as UTF-8
+    """
+    # ASCII is valid UTF-8; isascii scans word-at-a-time without decoding
+    if isinstance(data, bytes) and data.isascii():
+        return True
+    
+    # Decode in fixed windows so the probe never holds a full-size copy
+    # of the text; the incremental decoder carries split characters over
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = memoryview(data)
+    try:
+        for start in range(0, len(buffer), DECODE_WINDOW):
+            decoder.decode(buffer[start:start + DECODE_WINDOW])
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        buffer.release()
+    return True
+
+
+@dataclass(frozen=True)
+class FileInfo:
+    """Name, size, and extension of a file on disk, from a single stat."""
+    name: str
+    size: int
+    ext: str
+    
+    @classmethod
+    def from_stat(cls, file_path: str, stat: os.stat_result) -> "FileInfo":
+        """Build from an existing stat result.
+        
+        Args:
+            file_path: Path to file
+            stat: Result of os.stat / os.fstat for the file
+            
+        Returns:
+            FileInfo
+        """
+        name = os.path.basename(file_path)
+        return cls(name=name, size=stat.st_size, ext=_suffix(name))
+
+
+class ExcelWorkbook:
+    """An Excel workbook whose sheets are parsed on first use.
+    
+    The workbook stays open until every sheet has been parsed, so sheet
+    names are available without reading any cells.
+    
+    Sheets are parsed one at a time: openpyxl parses in pure Python and
+    holds the GIL, so threads would not overlap, and worker processes would
+    each need a pickled copy of the workbook and a fresh open of its archive.
+    """
+    
+    def __init__(self, file_bytes: bytes):
+        """Open workbook.
+        
+        Args:
+            file_bytes: Workbook content as bytes
+        """
+        self._excel_file = pd.ExcelFile(BytesIO(file_bytes))
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+        self.sheet_names: List[str] = self._excel_file.sheet_names
+        # Workbook bytes plus parsed frames, for cache accounting
+        self.nbytes = len(file_bytes)
+    
+    def parse(self, sheet_name: str) -> pd.DataFrame:
+        """Parse a sheet, reusing the result of earlier calls.
+        
+        Args:
+            sheet_name: Sheet to parse
+            
+        Returns:
+            Parsed DataFrame (shared; copy before modifying)
+        """
+        with self._lock:
+            df = self._frames.get(sheet_name)
+            if df is None:
+                df = self._excel_file.parse(sheet_name)
+                self._frames[sheet_name] = df
+                self.nbytes += int(df.memory_usage(deep=True).sum())
+                
+                # A read-only workbook keeps its archive open until closed
+                if len(self._frames) == len(self.sheet_names):
+                    self._excel_file.close()
+        return df
+
+
+class LazySheetMap(Mapping):
+    """Read-only mapping of sheet name to DataFrame, loaded on first access."""
+    
+    def __init__(self, sheet_names: List[str], load_sheet: Callable[[str], pd.DataFrame]):
+        """Initialize map.
+        
+        Args:
+            sheet_names: Sheet names in workbook order
+            load_sheet: Callable returning the DataFrame for a sheet name
+        """
+        self._sheet_names = sheet_names
+        self._load_sheet = load_sheet
+        self._frames: Dict[str, pd.DataFrame] = {}
+    
+    def __getitem__(self, sheet_name: str) -> pd.DataFrame:
+        df = self._frames.get(sheet_name)
+        if df is None:
+            if sheet_name not in self._sheet_names:
+                raise KeyError(sheet_name)
+            df = self._load_sheet(sheet_name)
+            self._frames[sheet_name] = df
+        return df
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sheet_names)
+    
+    def __len__(self) -> int:
+        return len(self._sheet_names)
+
+
 class DataIngestion:
     """Universal data loader for CSV, XLSX, and JSON files."""
     
-    SUPPORTED_FORMATS = ['.csv', '.xlsx', '.xls', '.json']
+    SUPPORTED_FORMATS = frozenset({'.csv', '.xlsx', '.xls', '.json'})
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+    MMAP_MIN_BYTES = 1024 * 1024  # 1MB
+    XLSX_CACHE_SIZE = 4
+    XLSX_CACHE_MAX_BYTES = 128 * 1024 * 1024  # 128MB
+    
+    # Opened workbooks by content digest, shared by all instances (LRU order,
+    # bounded by XLSX_CACHE_SIZE and XLSX_CACHE_MAX_BYTES)
+    _xlsx_cache: "OrderedDict[bytes, ExcelWorkbook]" = OrderedDict()
+    _xlsx_cache_lock = threading.Lock()
     
     def __init__(self):
         """Initialize data ingestion."""
@@ -27,7 +182,7 @@ class DataIngestion:
         Returns:
             File type: 'csv', 'xlsx', or 'json'
         """
-        ext = Path(filename).suffix.lower()
+        ext = _suffix(filename)
         
         if ext == '.csv':
             return 'csv'
@@ -49,7 +204,9 @@ class DataIngestion:
             Dict with:
                 - file_type: 'csv' | 'xlsx' | 'json'
                 - sheets: List of sheet names (for XLSX) or ['data'] for others
-                - dataframes: Dict[sheet_name, DataFrame]
+                - dataframes: Mapping[sheet_name, DataFrame] (read-only; XLSX
+                  sheets are parsed on first access, so async callers read
+                  them through load_sheet / load_sheets)
                 - metadata: Standardized file metadata
         """
         # Validate file size
@@ -71,6 +228,36 @@ class DataIngestion:
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
     
+    async def ingest_from_stream(
+        self,
+        readable: BinaryIO,
+        filename: str,
+        size_hint: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Universal file ingestion from a binary stream.
+        
+        The stream is read once and never past MAX_FILE_SIZE, so oversized
+        input is rejected without buffering all of it.
+        
+        Args:
+            readable: Binary stream positioned at the start of the content
+            filename: Original filename (for type detection)
+            size_hint: Content size if known, checked before reading
+            
+        Returns:
+            Dict with standardized metadata + DataFrames
+        """
+        if size_hint is not None and size_hint > self.MAX_FILE_SIZE:
+            raise ValueError(f"File too large: {size_hint / 1024 / 1024:.2f}MB (max 50MB)")
+        
+        # One byte past the limit is enough to tell the content is too large
+        limit = self.MAX_FILE_SIZE + 1
+        file_bytes = await asyncio.to_thread(readable.read, limit)
+        if len(file_bytes) == limit:
+            raise ValueError("File too large: over 50MB (max 50MB)")
+        
+        return await self.ingest_from_bytes(file_bytes, filename)
+    
     async def ingest_file(self, file_path: str) -> Dict[str, Any]:
         """Universal file ingestion from path (legacy method for analysis endpoints).
         
@@ -80,15 +267,28 @@ class DataIngestion:
         Returns:
             Dict with standardized metadata + DataFrames
         """
-        if not os.path.exists(file_path):
+        # Read file once into memory; open() doubles as the existence check
+        try:
+            with open(file_path, 'rb') as f:
+                # Stat the open descriptor once and reject oversized files
+                # before reading them
+                info = FileInfo.from_stat(file_path, os.fstat(f.fileno()))
+                if info.size > self.MAX_FILE_SIZE:
+                    raise ValueError(f"File too large: {info.size / 1024 / 1024:.2f}MB (max 50MB)")
+                
+                # Large CSVs are probed and parsed straight from the page
+                # cache instead of being copied into a bytes object first
+                if info.size >= self.MMAP_MIN_BYTES and self.detect_file_type(info.name) == 'csv':
+                    def parse() -> Dict[str, Any]:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                            utf8 = is_utf8(mapped)
+                        return self._parse_csv(file_path, utf8, info.size, memory_map=True)
+                    
+                    return await asyncio.to_thread(parse)
+                
+                return await self.ingest_from_stream(f, info.name, info.size)
+        except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {file_path}")
-        
-        # Read file once into memory
-        with open(file_path, 'rb') as f:
-            file_bytes = f.read()
-        
-        filename = os.path.basename(file_path)
-        return await self.ingest_from_bytes(file_bytes, filename)
     
     async def ingest_csv(self, file_path: str) -> pd.DataFrame:
         """Legacy method - loads CSV as single DataFrame from path.
@@ -102,6 +302,38 @@ class DataIngestion:
         result = await self.ingest_file(file_path)
         return result['dataframes']['data']
     
+    async def load_sheet(self, ingestion_result: Dict[str, Any], sheet_name: str) -> pd.DataFrame:
+        """Get one sheet of an ingestion result without blocking the event loop.
+        
+        XLSX sheets are parsed on first access, so that parse runs on a
+        worker thread here; frames that are already loaded return directly.
+        
+        Args:
+            ingestion_result: Result dict from an ingest method
+            sheet_name: Sheet to get
+        
+        Returns:
+            DataFrame
+        """
+        dataframes = ingestion_result['dataframes']
+        if not isinstance(dataframes, LazySheetMap):
+            return dataframes[sheet_name]
+        return await asyncio.to_thread(dataframes.__getitem__, sheet_name)
+    
+    async def load_sheets(self, ingestion_result: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+        """Get every sheet of an ingestion result without blocking the event loop.
+        
+        Args:
+            ingestion_result: Result dict from an ingest method
+        
+        Returns:
+            Dict of sheet name to DataFrame, in sheet order
+        """
+        dataframes = ingestion_result['dataframes']
+        if not isinstance(dataframes, LazySheetMap):
+            return dataframes
+        return await asyncio.to_thread(dict, dataframes)
+    
     async def _ingest_csv_from_bytes(self, bytes_io: BytesIO, file_size: int) -> Dict[str, Any]:
         """Ingest CSV from BytesIO.
         
@@ -112,19 +344,51 @@ class DataIngestion:
         Returns:
             Standardized result dict
         """
-        try:
-            # Try with default encoding
-            bytes_io.seek(0)
-            df = pd.read_csv(bytes_io)
-        except UnicodeDecodeError:
+        def parse() -> Dict[str, Any]:
+            return self._parse_csv(bytes_io, is_utf8(bytes_io.getvalue()), file_size)
+        
+        # Parse on a worker thread so the event loop keeps serving requests
+        return await asyncio.to_thread(parse)
+    
+    def _parse_csv(
+        self,
+        source: Union[str, BytesIO],
+        is_utf8: bool,
+        file_size: int,
+        **read_options
+    ) -> Dict[str, Any]:
+        """Parse CSV content into the standardized result dict.
+        
+        Args:
+            source: File path or BytesIO wrapper
+            is_utf8: Whether the content is valid UTF-8
+            file_size: Original file size
+            **read_options: Extra keyword arguments for pd.read_csv
+            
+        Returns:
+            Standardized result dict
+        """
+        # Pick the encoding up front so the parser runs once; a UTF-8 parse
+        # may only fail after much of the file was already parsed
+        if is_utf8:
+            encoding = 'utf-8'
+        else:
             # Fallback to latin-1
-            bytes_io.seek(0)
-            df = pd.read_csv(bytes_io, encoding='latin-1')
+            encoding = 'latin-1'
+        
+        try:
+            if isinstance(source, BytesIO):
+                source.seek(0)
+            df = pd.read_csv(source, encoding=encoding, **read_options)
         except Exception as e:
+            if encoding != 'utf-8':
+                raise
+            
             # Try with different separators
             try:
-                bytes_io.seek(0)
-                df = pd.read_csv(bytes_io, sep=';')
+                if isinstance(source, BytesIO):
+                    source.seek(0)
+                df = pd.read_csv(source, sep=';', **read_options)
             except:
                 raise ValueError(f"Failed to parse CSV: {str(e)}")
         
@@ -143,6 +407,33 @@ class DataIngestion:
     async def _ingest_xlsx_from_bytes(self, bytes_io: BytesIO, file_size: int) -> Dict[str, Any]:
         """Ingest XLSX from BytesIO with all sheets.
         
+        Args:
+            bytes_io: BytesIO wrapper
+            file_size: Original file size
+            
+        Returns:
+            Standardized result dict with all sheets
+        """
+        return await asyncio.to_thread(self._parse_xlsx, bytes_io, file_size)
+    
+    def _trim_xlsx_cache(self) -> None:
+        """Evict least recently used workbooks beyond the cache limits.
+        
+        Workbooks in use by a caller stay alive through its references;
+        eviction only stops later uploads from reusing them.
+        """
+        with self._xlsx_cache_lock:
+            total = sum(workbook.nbytes for workbook in self._xlsx_cache.values())
+            while self._xlsx_cache and (
+                total > self.XLSX_CACHE_MAX_BYTES
+                or len(self._xlsx_cache) > self.XLSX_CACHE_SIZE
+            ):
+                _, workbook = self._xlsx_cache.popitem(last=False)
+                total -= workbook.nbytes
+    
+    def _parse_xlsx(self, bytes_io: BytesIO, file_size: int) -> Dict[str, Any]:
+        """Open an XLSX workbook into the standardized result dict.
+        
         Args:
             bytes_io: BytesIO wrapper
             file_size: Original file size
@@ -151,20 +442,34 @@ class DataIngestion:
             Standardized result dict with all sheets
         """
         try:
-            # Load all sheets from BytesIO
-            bytes_io.seek(0)
-            excel_file = pd.ExcelFile(bytes_io)
-            sheet_names = excel_file.sheet_names
+            # Identical uploads reuse the workbook and sheets parsed last time
+            digest = hashlib.blake2b(bytes_io.getvalue(), digest_size=16).digest()
+            with self._xlsx_cache_lock:
+                workbook = self._xlsx_cache.get(digest)
+                if workbook is not None:
+                    self._xlsx_cache.move_to_end(digest)
             
-            dataframes = {}
-            total_rows = 0
-            total_columns = 0
+            if workbook is None:
+                # Open outside the lock so other uploads are not held up
+                workbook = ExcelWorkbook(bytes_io.getvalue())
+                with self._xlsx_cache_lock:
+                    self._xlsx_cache[digest] = workbook
+                self._trim_xlsx_cache()
             
-            for sheet_name in sheet_names:
-                df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                dataframes[sheet_name] = df
-                total_rows += len(df)
-                total_columns = max(total_columns, len(df.columns))
+            def load_sheet(sheet_name: str) -> pd.DataFrame:
+                try:
+                    # Callers may modify their frames; never hand out shared ones
+                    df = workbook.parse(sheet_name).copy()
+                    # Parsed frames grow the cached workbook
+                    self._trim_xlsx_cache()
+                except Exception as e:
+                    raise ValueError(f"Failed to parse XLSX: {str(e)}")
+                return df
+            
+            # Sheets are parsed only when a caller first reads them, so row
+            # and column counts are not known up front and are not reported
+            sheet_names = list(workbook.sheet_names)
+            dataframes = LazySheetMap(sheet_names, load_sheet)
             
             return {
                 'file_type': 'xlsx',
@@ -172,17 +477,7 @@ class DataIngestion:
                 'dataframes': dataframes,
                 'metadata': {
                     'total_sheets': len(sheet_names),
-                    'total_rows': total_rows,
-                    'total_columns': total_columns,
-                    'file_size_bytes': file_size,
-                    'sheet_info': [
-                        {
-                            'name': name,
-                            'rows': len(dataframes[name]),
-                            'columns': len(dataframes[name].columns)
-                        }
-                        for name in sheet_names
-                    ]
+                    'file_size_bytes': file_size
                 }
             }
             
@@ -192,6 +487,18 @@ class DataIngestion:
     async def _ingest_json_from_bytes(self, bytes_io: BytesIO, file_size: int) -> Dict[str, Any]:
         """Ingest JSON from BytesIO and flatten nested structures.
         
+        Args:
+            bytes_io: BytesIO wrapper
+            file_size: Original file size
+            
+        Returns:
+            Standardized result dict
+        """
+        return await asyncio.to_thread(self._parse_json, bytes_io, file_size)
+    
+    def _parse_json(self, bytes_io: BytesIO, file_size: int) -> Dict[str, Any]:
+        """Parse and flatten JSON into the standardized result dict.
+        
         Args:
             bytes_io: BytesIO wrapper
             file_size: Original file size
@@ -200,8 +507,8 @@ class DataIngestion:
             Standardized result dict
         """
         try:
-            bytes_io.seek(0)
-            data = json.load(bytes_io)
+            # Parse the shared buffer directly; no seek/read through the stream
+            data = json.loads(bytes_io.getvalue())
             
             # Flatten and convert to DataFrame
             df = self._flatten_json_to_dataframe(data)
@@ -236,36 +543,76 @@ class DataIngestion:
         if isinstance(data, list):
             # Array of objects
             if data and isinstance(data[0], dict):
-                # Normalize with json_normalize
-                return pd.json_normalize(data, sep='_')
+                # Normalize records into columns
+                return self._records_to_dataframe(data)
             else:
                 # Simple array
                 return pd.DataFrame({'value': data})
         
         elif isinstance(data, dict):
-            # Check if it's a simple key-value dict
-            if all(not isinstance(v, (dict, list)) for v in data.values()):
+            # One pass finds whether the dict is flat and, if not, the first
+            # array of objects (the main data array)
+            is_flat = True
+            array_key = None
+            for key, value in data.items():
+                value_type = type(value)
+                if value_type in _JSON_CONTAINERS:
+                    is_flat = False
+                    if value_type is list and value and type(value[0]) is dict:
+                        array_key = key
+                        break
+            
+            if is_flat:
                 # Simple flat dict - convert to single row
                 return pd.DataFrame([data])
-            else:
-                # Nested dict - try to find the main data array
-                for key, value in data.items():
-                    if isinstance(value, list) and value and isinstance(value[0], dict):
-                        # Found array of objects
-                        df = pd.json_normalize(value, sep='_')
-                        # Add other top-level keys as columns
-                        for k, v in data.items():
-                            if k != key and not isinstance(v, (dict, list)):
-                                df[k] = v
-                        return df
+            
+            if array_key is not None:
+                # Nested dict with an array of objects
+                df = self._records_to_dataframe(data[array_key])
                 
-                # No array found - flatten the dict
-                return pd.json_normalize(data, sep='_')
+                # Add other top-level keys as columns, building the
+                # frame once instead of inserting column by column;
+                # dict.update keeps an overwritten column in place
+                scalars = {
+                    k: v for k, v in data.items()
+                    if k != array_key and type(v) not in _JSON_CONTAINERS
+                }
+                if not scalars:
+                    return df
+                
+                columns = {c: df[c] for c in df.columns}
+                columns.update({k: [v] * len(df) for k, v in scalars.items()})
+                return pd.DataFrame(columns, index=df.index, copy=False)
+            
+            # No array found - flatten the dict
+            return pd.json_normalize(data, sep='_')
         
         else:
             # Primitive value
             return pd.DataFrame({'value': [data]})
     
+    def _records_to_dataframe(self, records: List[Any]) -> pd.DataFrame:
+        """Build a DataFrame from an array of JSON objects.
+        
+        Records without nested objects are already flat, so they skip the
+        per-record recursive walk in json_normalize.
+        
+        Args:
+            records: List of JSON records
+            
+        Returns:
+            DataFrame with nested keys joined by '_'
+        """
+        is_flat = all(
+            type(record) is dict
+            and not any(type(v) is dict for v in record.values())
+            for record in records
+        )
+        if is_flat:
+            return pd.DataFrame(records)
+        
+        return pd.json_normalize(records, sep='_')
+    
     def _analyze_json_structure(self, data: Any) -> str:
         """Analyze JSON structure type.
         
@@ -281,7 +628,9 @@ class DataIngestion:
             else:
                 return f"array_of_primitives (length: {len(data)})"
         elif isinstance(data, dict):
-            nested_count = sum(1 for v in data.values() if isinstance(v, (dict, list)))
+            # Parsed JSON only yields exact dicts and lists, so an identity
+            # test on the type is enough and skips isinstance's MRO walk
+            nested_count = sum(1 for v in data.values() if type(v) in _JSON_CONTAINERS)
             return f"object (keys: {len(data)}, nested: {nested_count})"
         else:
             return "primitive"
@@ -295,7 +644,7 @@ class DataIngestion:
         Returns:
             True if valid
         """
-        ext = Path(filename).suffix.lower()
+        ext = _suffix(filename)
         return ext in self.SUPPORTED_FORMATS
     
     def get_file_metadata(self, file_path: str) -> Dict[str, Any]:
@@ -307,9 +656,11 @@ class DataIngestion:
         Returns:
             Dict containing metadata
         """
+        info = FileInfo.from_stat(file_path, os.stat(file_path))
+        
         return {
-            "filename": os.path.basename(file_path),
-            "size_bytes": os.path.getsize(file_path),
+            "filename": info.name,
+            "size_bytes": info.size,
             "path": file_path,
-            "extension": Path(file_path).suffix.lower()
+            "extension": info.ext
         }
@@ -4,10 +4,11 @@ import pandas as pd
 import json
 from io import BytesIO
 from pathlib import Path
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple
 from dataclasses import dataclass
 
 from .dataset_registry import DatasetRegistry
+from .ingestion import is_utf8
 
 
 @dataclass
@@ -50,7 +51,7 @@ class DataIngestionEngine:
         Raises:
             ValueError: If file format not supported or parsing fails
         """
-        # Validate extension
+        # Validate extension; computed once and reused by the parsers
         file_ext = Path(filename).suffix.lower()
         if file_ext not in self.SUPPORTED_FORMATS:
             raise ValueError(
@@ -61,27 +62,20 @@ class DataIngestionEngine:
         file_size = len(file_bytes)
         
         # Validate size
-        if file_size > self.MAX_FILE_SIZE:
-            raise ValueError(
-                f"File too large: {file_size / 1024 / 1024:.2f}MB "
-                f"(max {self.MAX_FILE_SIZE / 1024 / 1024:.0f}MB)"
-            )
-        
-        if file_size == 0:
-            raise ValueError("Empty file received")
-        
-        # Create fresh BytesIO from bytes
-        bytes_io = BytesIO(file_bytes)
+        self.validate_size(file_size)
         
-        # Parse based on format
+        # Parse based on format; only the pandas readers need a stream,
+        # so a fresh BytesIO is created for them alone
         source_type = self._get_source_type(file_ext)
         
         if source_type == 'csv':
-            datasets, metadata = self._parse_csv(bytes_io, filename, file_size)
+            with BytesIO(file_bytes) as bytes_io:
+                datasets, metadata = self._parse_csv(bytes_io, filename, file_size)
         elif source_type == 'xlsx':
-            datasets, metadata = self._parse_xlsx(bytes_io, filename, file_size)
+            with BytesIO(file_bytes) as bytes_io:
+                datasets, metadata = self._parse_xlsx(bytes_io, filename, file_size, file_ext)
         elif source_type == 'json':
-            datasets, metadata = self._parse_json(bytes_io, filename, file_size)
+            datasets, metadata = self._parse_json(file_bytes, filename, file_size)
         else:
             raise ValueError(f"Unsupported source type: {source_type}")
         
@@ -92,6 +86,27 @@ class DataIngestionEngine:
             metadata=metadata
         )
     
+    def validate_size(self, file_size: int) -> None:
+        """Check a file size against the engine limits.
+        
+        Callers holding a stream can check its size with this before
+        reading it into memory.
+        
+        Args:
+            file_size: File size in bytes
+            
+        Raises:
+            ValueError: If the file is empty or larger than MAX_FILE_SIZE
+        """
+        if file_size > self.MAX_FILE_SIZE:
+            raise ValueError(
+                f"File too large: {file_size / 1024 / 1024:.2f}MB "
+                f"(max {self.MAX_FILE_SIZE / 1024 / 1024:.0f}MB)"
+            )
+        
+        if file_size == 0:
+            raise ValueError("Empty file received")
+    
     def _get_source_type(self, file_ext: str) -> str:
         """Map file extension to source type."""
         if file_ext == '.csv':
@@ -116,13 +131,20 @@ class DataIngestionEngine:
         df = None
         last_error = None
         
-        attempts = [
-            {'encoding': 'utf-8'},
-            {'encoding': 'utf-8', 'sep': ';'},
-            {'encoding': 'latin-1'},
-            {'encoding': 'latin-1', 'sep': ';'},
-            {'encoding': 'cp1252'},
-        ]
+        # Probe the encoding once instead of letting every UTF-8 attempt
+        # fail after a full parse; for valid UTF-8 the single-byte
+        # encodings would only repeat the same tokenizing errors
+        if is_utf8(bytes_io.getvalue()):
+            attempts = [
+                {'encoding': 'utf-8'},
+                {'encoding': 'utf-8', 'sep': ';'},
+            ]
+        else:
+            attempts = [
+                {'encoding': 'latin-1'},
+                {'encoding': 'latin-1', 'sep': ';'},
+                {'encoding': 'cp1252'},
+            ]
         
         for params in attempts:
             try:
@@ -153,36 +175,44 @@ class DataIngestionEngine:
         self, 
         bytes_io: BytesIO, 
         filename: str, 
-        file_size: int
+        file_size: int,
+        file_ext: str
     ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Any]]:
         """Parse XLSX/XLS from BytesIO with multi-sheet support."""
         bytes_io.seek(0)
         
         try:
-            # Determine engine based on extension
-            file_ext = Path(filename).suffix.lower()
+            # Determine engine based on extension (already lower-cased)
             engine = 'openpyxl' if file_ext == '.xlsx' else 'xlrd'
             
-            # Read all sheets
-            excel_file = pd.ExcelFile(bytes_io, engine=engine)
-            sheet_names = excel_file.sheet_names
-            
             datasets = {}
             total_rows = 0
             total_columns = 0
             sheet_info = []
             
-            for sheet_name in sheet_names:
-                df = pd.read_excel(excel_file, sheet_name=sheet_name)
+            # Read all sheets through one handle; pandas opens openpyxl
+            # workbooks read-only, which keeps the zip archive open until
+            # the handle is closed. Sheets are parsed in turn: a pool would
+            # need its own copy of the upload and open of the archive per
+            # sheet, and this runs inside the upload request
+            with pd.ExcelFile(bytes_io, engine=engine) as excel_file:
+                sheet_names = excel_file.sheet_names
+                frames = [excel_file.parse(sheet_name) for sheet_name in sheet_names]
+            
+            for sheet_name, df in zip(sheet_names, frames):
                 datasets[sheet_name] = df
-                total_rows += len(df)
-                total_columns = max(total_columns, len(df.columns))
+                
+                # Measure each sheet once and reuse for totals and info
+                rows = len(df)
+                column_names = df.columns.tolist()
+                total_rows += rows
+                total_columns = max(total_columns, len(column_names))
                 
                 sheet_info.append({
                     'name': sheet_name,
-                    'rows': len(df),
-                    'columns': len(df.columns),
-                    'column_names': df.columns.tolist()
+                    'rows': rows,
+                    'columns': len(column_names),
+                    'column_names': column_names
                 })
             
             metadata = {
@@ -202,19 +232,17 @@ class DataIngestionEngine:
     
     def _parse_json(
         self, 
-        bytes_io: BytesIO, 
+        file_bytes: bytes, 
         filename: str, 
         file_size: int
     ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Any]]:
-        """Parse JSON from BytesIO and flatten to DataFrame."""
-        bytes_io.seek(0)
-        
+        """Parse JSON from raw bytes and flatten to DataFrame."""
         try:
-            raw_text = bytes_io.read().decode('utf-8')
-            data = json.loads(raw_text)
+            # json.loads decodes bytes itself; skip the intermediate str copy
+            data = json.loads(file_bytes)
             
-            # Flatten JSON to DataFrame
-            df = self._flatten_json(data)
+            # Flatten JSON to DataFrame; the same walk describes its shape
+            df, json_structure = self._flatten_json(data)
             
             datasets = {'data': df}
             metadata = {
@@ -225,7 +253,7 @@ class DataIngestionEngine:
                 'total_rows': len(df),
                 'total_columns': len(df.columns),
                 'columns': df.columns.tolist(),
-                'json_structure': self._analyze_json_structure(data)
+                'json_structure': json_structure
             }
             
             return datasets, metadata
@@ -235,40 +263,77 @@ class DataIngestionEngine:
         except Exception as e:
             raise ValueError(f"Failed to parse JSON: {str(e)}")
     
-    def _flatten_json(self, data: Any) -> pd.DataFrame:
-        """Flatten nested JSON to DataFrame."""
+    def _flatten_json(self, data: Any) -> Tuple[pd.DataFrame, str]:
+        """Flatten nested JSON to DataFrame and describe its structure."""
         if isinstance(data, list):
             if data and isinstance(data[0], dict):
-                return pd.json_normalize(data, sep='_')
+                return self._normalize_records(data), f"array_of_objects (length: {len(data)})"
             else:
-                return pd.DataFrame({'value': data})
+                return pd.DataFrame({'value': data}), f"array_of_primitives (length: {len(data)})"
         
         elif isinstance(data, dict):
-            if all(not isinstance(v, (dict, list)) for v in data.values()):
-                return pd.DataFrame([data])
-            
+            # One pass over the values counts nested containers and finds
+            # the first array of objects
+            nested = 0
+            array_key = None
             for key, value in data.items():
-                if isinstance(value, list) and value and isinstance(value[0], dict):
-                    df = pd.json_normalize(value, sep='_')
-                    for k, v in data.items():
-                        if k != key and not isinstance(v, (dict, list)):
-                            df[k] = v
-                    return df
+                if isinstance(value, (dict, list)):
+                    nested += 1
+                    if (array_key is None and isinstance(value, list)
+                            and value and isinstance(value[0], dict)):
+                        array_key = key
+            structure = f"object (keys: {len(data)}, nested: {nested})"
+            
+            if not nested:
+                return pd.DataFrame([data]), structure
             
-            return pd.json_normalize(data, sep='_')
+            if array_key is not None:
+                df = self._normalize_records(data[array_key])
+                for k, v in data.items():
+                    if k != array_key and not isinstance(v, (dict, list)):
+                        df[k] = v
+                return df, structure
+            
+            return self._normalize_records([data]), structure
         
         else:
-            return pd.DataFrame({'value': [data]})
+            return pd.DataFrame({'value': [data]}), "primitive"
     
-    def _analyze_json_structure(self, data: Any) -> str:
-        """Analyze JSON structure type."""
-        if isinstance(data, list):
-            if data and isinstance(data[0], dict):
-                return f"array_of_objects (length: {len(data)})"
+    def _normalize_records(self, records: List[Any]) -> pd.DataFrame:
+        """Flatten JSON records to DataFrame, joining nested keys with '_'.
+        
+        Produces the same frame as pd.json_normalize(records, sep='_') but
+        flattens each record in one walk, without json_normalize's
+        per-record bookkeeping.
+        """
+        if not all(type(record) is dict for record in records):
+            return pd.json_normalize(records, sep='_')
+        
+        # Flat records are already rows; the scan stops at the first nested one
+        if not any(isinstance(value, dict) for record in records for value in record.values()):
+            return pd.DataFrame(records)
+        
+        rows = []
+        for record in records:
+            # Top-level scalars keep their order; nested keys follow them
+            row = {}
+            nested = []
+            for key, value in record.items():
+                if isinstance(value, dict):
+                    nested.append((key, value))
+                else:
+                    row[key] = value
+            for key, value in nested:
+                self._flatten_into(row, key, value)
+            rows.append(row)
+        
+        return pd.DataFrame(rows)
+    
+    def _flatten_into(self, row: Dict[str, Any], prefix: str, value: Dict[str, Any]) -> None:
+        """Add the leaves of a nested dict to row under prefix-joined keys."""
+        for key, child in value.items():
+            name = f"{prefix}_{key}" if prefix else key
+            if isinstance(child, dict):
+                self._flatten_into(row, name, child)
             else:
-                return f"array_of_primitives (length: {len(data)})"
-        elif isinstance(data, dict):
-            nested = sum(1 for v in data.values() if isinstance(v, (dict, list)))
-            return f"object (keys: {len(data)}, nested: {nested})"
-        else:
-            return "primitive"
+                row[name] = child
@@ -8,7 +8,29 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional, Set
 from enum import Enum
 from datetime import datetime
-import uuid
+import itertools
+import os
+
+
+def _reset_id_source() -> None:
+    """Start a fresh ID sequence under a new random process prefix."""
+    global _id_prefix, _id_counter
+    _id_prefix = os.urandom(8).hex()
+    _id_counter = itertools.count()
+
+
+def _next_id() -> str:
+    """Return a unique ID: a random per-process prefix plus a counter.
+
+    Far cheaper than ``uuid4`` per instance while staying unique across
+    processes and restarts.
+    """
+    return f"{_id_prefix}-{next(_id_counter):x}"
+
+
+_reset_id_source()
+# Forked workers must not continue the parent's sequence
+os.register_at_fork(after_in_child=_reset_id_source)
 
 
 class SheetRole(Enum):
@@ -37,10 +59,10 @@ class ColumnSemanticType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class Entity:
     """A detected entity (thing that can be tracked/measured)."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_next_id)
     canonical_name: str = ""
     source_columns: List[str] = field(default_factory=list)
     source_sheets: List[str] = field(default_factory=list)
@@ -52,10 +74,10 @@ class Entity:
         return hash(self.id)
 
 
-@dataclass
+@dataclass(slots=True)
 class Fact:
     """A recorded fact/measurement about an entity."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_next_id)
     entity_id: str = ""
     metric_name: str = ""
     value: Any = None
@@ -65,10 +87,10 @@ class Fact:
     context: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Plan:
     """A planned/target value for an entity-metric pair."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_next_id)
     entity_id: str = ""
     metric_name: str = ""
     target_value: Any = None
@@ -78,10 +100,10 @@ class Plan:
     confidence: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Actual:
     """An actual/realized value for an entity-metric pair."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_next_id)
     entity_id: str = ""
     metric_name: str = ""
     actual_value: Any = None
@@ -90,10 +112,10 @@ class Actual:
     confidence: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Gap:
     """A detected gap between plan and actual."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_next_id)
     entity_id: str = ""
     metric_name: str = ""
     plan_value: Any = None
@@ -105,10 +127,10 @@ class Gap:
     period: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Constraint:
     """A detected constraint or limiting factor."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_next_id)
     entity_id: Optional[str] = None
     constraint_type: str = ""  # "capacity", "deadline", "dependency", "resource", "policy"
     description: str = ""
@@ -119,10 +141,10 @@ class Constraint:
     extracted_values: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     """A potential action that could address a gap or constraint."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_next_id)
     action_type: str = ""  # "increase", "decrease", "reallocate", "investigate", "escalate"
     target_entity_id: str = ""
     target_metric: str = ""
@@ -134,10 +156,10 @@ class Action:
     related_constraints: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Decision:
     """A decision candidate with supporting evidence."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_next_id)
     decision_type: str = ""  # "approve", "reject", "modify", "investigate", "defer"
     summary: str = ""
     reasoning: str = ""
@@ -152,7 +174,7 @@ class Decision:
     status: str = "candidate"  # "candidate", "accepted", "rejected", "implemented"
 
 
-@dataclass
+@dataclass(slots=True)
 class DecisionContext:
     """Full context for decision-making."""
     entities: Dict[str, Entity] = field(default_factory=dict)
@@ -1,5 +1,6 @@
 """Data preprocessing module."""
 
+import numpy as np
 import pandas as pd
 from typing import Optional
 
@@ -7,6 +8,12 @@ from typing import Optional
 class DataPreprocessor:
     """Preprocess data for modeling."""
     
+    # Placeholder strings treated as missing values
+    MISSING_MARKERS = ['', 'N/A', 'NA', 'n/a', 'null', 'NULL', 'NaN', 'nan']
+    
+    # Imputation strategies backed by a DataFrame reduction
+    IMPUTE_STRATEGIES = frozenset({'mean', 'median'})
+    
     def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean and standardize data.
         
@@ -16,21 +23,30 @@ class DataPreprocessor:
         Returns:
             Cleaned DataFrame
         """
-        # Placeholder: Implement data cleaning
-        pass
+        # Whole-frame replace and vectorized string ops, no row iteration
+        df = df.replace(self.MISSING_MARKERS, np.nan)
+        df.columns = df.columns.map(str).str.strip().str.lower()
+        return df
     
     def handle_missing_values(self, df: pd.DataFrame, strategy: str = "mean") -> pd.DataFrame:
         """Handle missing values.
         
         Args:
             df: Input DataFrame
-            strategy: Imputation strategy
+            strategy: Imputation strategy ('mean', 'median' or 'mode')
             
         Returns:
             DataFrame with imputed values
         """
-        # Placeholder: Implement missing value handling
-        pass
+        if strategy == 'mode':
+            modes = df.mode(dropna=True)
+            return df.fillna(modes.iloc[0]) if len(modes) else df
+        if strategy not in self.IMPUTE_STRATEGIES:
+            raise ValueError(f"Unsupported imputation strategy: {strategy}")
+        
+        # One column-wise reduction fills every numeric column at once
+        fill_values = getattr(df, strategy)(numeric_only=True)
+        return df.fillna(fill_values)
     
     def normalize_dates(self, df: pd.DataFrame, date_col: str) -> pd.DataFrame:
         """Normalize and parse date column.
@@ -42,18 +58,33 @@ class DataPreprocessor:
         Returns:
             DataFrame with normalized dates
         """
-        # Placeholder: Implement date normalization
-        pass
+        df = df.copy()
+        values = df[date_col]
+        
+        # ISO 8601 keeps to the fast parser; only leftovers take the slow path
+        parsed = pd.to_datetime(values, errors='coerce', utc=True, format='ISO8601')
+        unparsed = parsed.isna() & values.notna()
+        if unparsed.any():
+            parsed[unparsed] = pd.to_datetime(
+                values[unparsed], errors='coerce', utc=True, format='mixed'
+            )
+        
+        df[date_col] = parsed
+        return df
     
-    def resample_timeseries(self, df: pd.DataFrame, freq: str = "D") -> pd.DataFrame:
+    def resample_timeseries(self, df: pd.DataFrame, freq: str = "D",
+                            date_col: Optional[str] = None) -> pd.DataFrame:
         """Resample time series data.
         
         Args:
             df: Input DataFrame
             freq: Resampling frequency
+            date_col: Date column to resample on (defaults to the index)
             
         Returns:
             Resampled DataFrame
         """
-        # Placeholder: Implement resampling
-        pass
+        if date_col is not None:
+            df = self.normalize_dates(df, date_col).set_index(date_col)
+        
+        return df.resample(freq).mean(numeric_only=True)
@@ -8,8 +8,8 @@ Builds a graph of relationships between entities based on:
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Set, Tuple, Any, Optional
-from collections import defaultdict
+from typing import Dict, List, FrozenSet, Tuple, Any, Optional
+from collections import defaultdict, deque
 from dataclasses import dataclass
 
 from .ontology import Entity, DecisionContext
@@ -17,7 +17,7 @@ from .entity_detector import EntityDetector
 from .sheet_classifier import SheetProfile, SheetRole
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Relationship:
     """A relationship between two entities."""
     source_entity_id: str
@@ -32,7 +32,10 @@ class RelationshipGraph:
     
     def __init__(self):
         self.relationships: List[Relationship] = []
-        self.adjacency: Dict[str, Set[str]] = defaultdict(set)
+        self.adjacency: Dict[str, FrozenSet[str]] = {}
+        # Neighbours as added, repeats included; deduplicated into
+        # adjacency once the passes finish
+        self._edges: Dict[str, List[str]] = defaultdict(list)
         self.relationship_index: Dict[Tuple[str, str], Relationship] = {}
     
     def build_graph(
@@ -41,7 +44,7 @@ class RelationshipGraph:
         entities: Dict[str, Entity],
         entity_detector: EntityDetector,
         sheet_profiles: Dict[str, SheetProfile]
-    ) -> Dict[str, Set[str]]:
+    ) -> Dict[str, FrozenSet[str]]:
         """Build entity relationship graph.
         
         Args:
@@ -53,48 +56,90 @@ class RelationshipGraph:
         Returns:
             Adjacency dict mapping entity_id to related entity_ids
         """
+        # Resolve column entities once for all passes
+        column_entities = self._map_column_entities(datasets, entity_detector)
+        
         # Find relationships through different mechanisms
         self._find_co_occurrence_relationships(
-            datasets, entities, entity_detector, sheet_profiles
+            datasets, entities, column_entities, sheet_profiles
         )
         self._find_reference_relationships(
-            datasets, entities, entity_detector
+            datasets, entities, column_entities
         )
         self._find_aggregation_relationships(
             datasets, entities, sheet_profiles
         )
         
+        # Every entity gets an adjacency entry, related or not
+        for entity in entities.values():
+            self._edges[entity.id]
+        
+        self.adjacency = {
+            entity_id: frozenset(neighbours)
+            for entity_id, neighbours in self._edges.items()
+        }
+        
         # Update entity objects with relationships
         for entity in entities.values():
             entity.related_entities = list(self.adjacency[entity.id])
         
         return dict(self.adjacency)
     
+    def _map_column_entities(
+        self,
+        datasets: Dict[str, pd.DataFrame],
+        entity_detector: EntityDetector
+    ) -> Dict[str, Dict[str, Entity]]:
+        """Map each sheet's columns to their detected entities.
+        
+        Args:
+            datasets: Sheet data
+            entity_detector: Entity detector with column mappings
+            
+        Returns:
+            Dict of sheet name to {column name: entity}, for columns
+            that have an entity
+        """
+        column_entities = {}
+        for sheet_name, df in datasets.items():
+            sheet_entities = {}
+            for col in df.columns:
+                entity = entity_detector.get_entity_for_column(sheet_name, str(col))
+                if entity:
+                    sheet_entities[str(col)] = entity
+            column_entities[sheet_name] = sheet_entities
+        return column_entities
+    
     def _find_co_occurrence_relationships(
         self,
         datasets: Dict[str, pd.DataFrame],
         entities: Dict[str, Entity],
-        entity_detector: EntityDetector,
+        column_entities: Dict[str, Dict[str, Entity]],
         sheet_profiles: Dict[str, SheetProfile]
     ):
         """Find entities that co-occur in the same rows."""
         for sheet_name, df in datasets.items():
             # Find all entity columns in this sheet
-            entity_columns = []
-            for col in df.columns:
-                entity = entity_detector.get_entity_for_column(sheet_name, str(col))
-                if entity:
-                    entity_columns.append((str(col), entity))
+            entity_columns = list(column_entities[sheet_name].items())
+            
+            if len(entity_columns) < 2:
+                continue
+            
+            # Pairwise counts of rows where both columns are present, from
+            # one matrix product instead of a dropna copy per pair
+            present = df[[col for col, _ in entity_columns]].notna().to_numpy(dtype=np.int32)
+            co_counts = present.T @ present
+            total = df.shape[0]
             
             # Find co-occurring entities
             for i, (col1, entity1) in enumerate(entity_columns):
-                for col2, entity2 in entity_columns[i+1:]:
+                for j in range(i + 1, len(entity_columns)):
+                    col2, entity2 = entity_columns[j]
                     if entity1.id == entity2.id:
                         continue
                     
                     # Calculate co-occurrence strength
-                    both_present = df[[col1, col2]].dropna().shape[0]
-                    total = df.shape[0]
+                    both_present = int(co_counts[i, j])
                     
                     if total > 0 and both_present / total > 0.5:
                         strength = both_present / total
@@ -117,9 +162,16 @@ class RelationshipGraph:
         self,
         datasets: Dict[str, pd.DataFrame],
         entities: Dict[str, Entity],
-        entity_detector: EntityDetector
+        column_entities: Dict[str, Dict[str, Entity]]
     ):
         """Find foreign key-like references between entities."""
+        # Distinct entities per sheet, in column order; repeats would only
+        # produce duplicate relationships
+        sheet_entity_ids = {
+            sheet_name: list(dict.fromkeys(e.id for e in sheet_entities.values()))
+            for sheet_name, sheet_entities in column_entities.items()
+        }
+        
         # For each entity, check if its values appear in other sheets
         for entity in entities.values():
             if len(entity.source_sheets) < 2:
@@ -133,19 +185,16 @@ class RelationshipGraph:
                     continue
                 
                 # Find other entities in the other sheet
-                other_df = datasets.get(other_sheet)
-                if other_df is None:
+                other_entity_ids = sheet_entity_ids.get(other_sheet)
+                if other_entity_ids is None:
                     continue
                 
-                for col in other_df.columns:
-                    other_entity = entity_detector.get_entity_for_column(
-                        other_sheet, str(col)
-                    )
-                    if other_entity and other_entity.id != entity.id:
+                for other_entity_id in other_entity_ids:
+                    if other_entity_id != entity.id:
                         # Check value overlap
                         rel = Relationship(
                             source_entity_id=entity.id,
-                            target_entity_id=other_entity.id,
+                            target_entity_id=other_entity_id,
                             relationship_type="references",
                             strength=0.7,
                             evidence={
@@ -176,45 +225,89 @@ class RelationshipGraph:
             ]
         ]
         
+        if not summary_sheets:
+            return
+        
+        # Sum each detail sheet's numeric columns once, for every summary
+        # sheet to match against
+        detail_totals = []
+        for detail_sheet in detail_sheets:
+            detail_df = datasets.get(detail_sheet)
+            if detail_df is None:
+                continue
+            
+            detail_numeric = detail_df.select_dtypes(include=[np.number]).columns
+            detail_sums = detail_df[detail_numeric].sum().to_numpy(dtype=np.float64)
+            detail_totals.append((detail_sheet, detail_numeric, detail_sums))
+        
         # Check if summary sheets aggregate detail sheets
         for summary_sheet in summary_sheets:
             summary_df = datasets.get(summary_sheet)
             if summary_df is None:
                 continue
             
-            for detail_sheet in detail_sheets:
-                detail_df = datasets.get(detail_sheet)
-                if detail_df is None:
-                    continue
-                
-                # Check for numeric columns that could be aggregated
-                summary_numeric = summary_df.select_dtypes(include=[np.number]).columns
-                detail_numeric = detail_df.select_dtypes(include=[np.number]).columns
-                
+            summary_numeric = summary_df.select_dtypes(include=[np.number]).columns
+            
+            # Sorted non-null values per summary column, shared by every
+            # detail sheet
+            summary_values = []
+            for sum_col in summary_numeric:
+                values = summary_df[sum_col].to_numpy(dtype=np.float64, na_value=np.nan)
+                values = np.sort(values[~np.isnan(values)])
+                if values.size:
+                    summary_values.append((sum_col, values))
+            
+            for detail_sheet, detail_numeric, detail_sums in detail_totals:
                 # Find matching aggregations
-                for sum_col in summary_numeric:
-                    for det_col in detail_numeric:
-                        detail_sum = detail_df[det_col].sum()
-                        summary_vals = summary_df[sum_col].dropna()
-                        
-                        if not summary_vals.empty:
-                            # Check if any summary value matches detail sum
-                            for val in summary_vals:
-                                if abs(val - detail_sum) < 0.01 * abs(detail_sum) if detail_sum != 0 else val == 0:
-                                    # Found aggregation relationship
-                                    rel = Relationship(
-                                        source_entity_id=f"sheet:{detail_sheet}",
-                                        target_entity_id=f"sheet:{summary_sheet}",
-                                        relationship_type="aggregates",
-                                        strength=0.9,
-                                        evidence={
-                                            'detail_column': str(det_col),
-                                            'summary_column': str(sum_col),
-                                            'aggregation_type': 'sum'
-                                        }
-                                    )
-                                    self._add_relationship(rel)
-                                    break
+                for sum_col, values in summary_values:
+                    matched = self._match_sums(values, detail_sums)
+                    
+                    for det_col in detail_numeric[matched]:
+                        # Found aggregation relationship
+                        rel = Relationship(
+                            source_entity_id=f"sheet:{detail_sheet}",
+                            target_entity_id=f"sheet:{summary_sheet}",
+                            relationship_type="aggregates",
+                            strength=0.9,
+                            evidence={
+                                'detail_column': str(det_col),
+                                'summary_column': str(sum_col),
+                                'aggregation_type': 'sum'
+                            }
+                        )
+                        self._add_relationship(rel)
+    
+    def _match_sums(self, sorted_values: np.ndarray, sums: np.ndarray) -> np.ndarray:
+        """Find the sums matched by any of a set of values.
+        
+        A value matches a non-zero sum when it lies within 1% of it, and
+        a zero sum only when it is exactly zero.
+        
+        Args:
+            sorted_values: Candidate values, sorted ascending
+            sums: Column sums to match
+            
+        Returns:
+            Boolean array, True where a sum is matched
+        """
+        tolerance = 0.01 * np.abs(sums)
+        zero_sums = sums == 0
+        
+        # The value closest to a sum is one of its two neighbours in sorted
+        # order, so a binary search leaves two candidates per sum
+        upper = np.searchsorted(sorted_values, sums)
+        last = sorted_values.size - 1
+        matched = np.zeros(sums.shape, dtype=bool)
+        
+        for index in (np.maximum(upper - 1, 0), np.minimum(upper, last)):
+            candidates = sorted_values[index]
+            matched |= np.where(
+                zero_sums,
+                candidates == 0,
+                np.abs(candidates - sums) < tolerance
+            )
+        
+        return matched
     
     def _add_relationship(self, rel: Relationship):
         """Add a relationship to the graph."""
@@ -230,13 +323,13 @@ class RelationshipGraph:
             self.relationships.append(rel)
             self.relationship_index[key] = rel
         
-        # Update adjacency
-        self.adjacency[rel.source_entity_id].add(rel.target_entity_id)
-        self.adjacency[rel.target_entity_id].add(rel.source_entity_id)
+        # Record adjacency; repeats are dropped when the graph is built
+        self._edges[rel.source_entity_id].append(rel.target_entity_id)
+        self._edges[rel.target_entity_id].append(rel.source_entity_id)
     
-    def get_related_entities(self, entity_id: str) -> Set[str]:
+    def get_related_entities(self, entity_id: str) -> FrozenSet[str]:
         """Get all entities related to a given entity."""
-        return self.adjacency.get(entity_id, set())
+        return self.adjacency.get(entity_id, frozenset())
     
     def get_relationship(
         self, 
@@ -253,16 +346,20 @@ class RelationshipGraph:
         max_depth: int = 3
     ) -> Dict[str, int]:
         """Get all entities reachable from start within max_depth."""
+        adjacency = self.adjacency
         visited = {start_entity_id: 0}
-        frontier = [start_entity_id]
+        queue = deque([(start_entity_id, 0)])
         
-        for depth in range(1, max_depth + 1):
-            next_frontier = []
-            for entity_id in frontier:
-                for related_id in self.adjacency.get(entity_id, set()):
-                    if related_id not in visited:
-                        visited[related_id] = depth
-                        next_frontier.append(related_id)
-            frontier = next_frontier
+        # Breadth-first, so each entity keeps its shortest depth
+        while queue:
+            entity_id, depth = queue.popleft()
+            if depth == max_depth:
+                continue
+            
+            # get() covers IDs that are not in the graph
+            for related_id in adjacency.get(entity_id, ()):
+                if related_id not in visited:
+                    visited[related_id] = depth + 1
+                    queue.append((related_id, depth + 1))
         
         return visited
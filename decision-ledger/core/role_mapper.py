@@ -1,8 +1,9 @@
 """Column role detection and mapping system."""
 
+import re
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from collections import Counter
 
 
@@ -10,10 +11,33 @@ class ColumnRoleMapper:
     """Detect and map column roles for data modeling."""
     
     VALID_ROLES = ["TIME", "ACTION", "OUTCOME", "METRIC", "DIMENSION", "IGNORE"]
+    INFINITE_VALUES = [np.inf, -np.inf]
+    
+    # Column name keywords, each group compiled into one alternation
+    TIME_KEYWORDS = ['date', 'time', 'datetime', 'timestamp', 'day', 'month', 'year', 'dt']
+    
+    # ACTION keywords (controllable inputs)
+    ACTION_KEYWORDS = ['spend', 'cost', 'budget', 'investment', 'expense', 
+                       'price', 'bid', 'rate', 'allocation']
+    
+    # OUTCOME keywords (KPIs to optimize)
+    OUTCOME_KEYWORDS = ['revenue', 'sales', 'profit', 'income', 'earnings',
+                        'return', 'roi', 'conversion', 'ctr', 'roas']
+    
+    # METRIC keywords (supporting metrics)
+    METRIC_KEYWORDS = ['click', 'impression', 'view', 'visitor', 'user',
+                       'engagement', 'bounce', 'session']
+    
+    TIME_PATTERN = re.compile('|'.join(map(re.escape, TIME_KEYWORDS)))
+    ACTION_PATTERN = re.compile('|'.join(map(re.escape, ACTION_KEYWORDS)))
+    OUTCOME_PATTERN = re.compile('|'.join(map(re.escape, OUTCOME_KEYWORDS)))
+    METRIC_PATTERN = re.compile('|'.join(map(re.escape, METRIC_KEYWORDS)))
     
     def __init__(self):
         """Initialize role mapper."""
         self.column_roles = {}
+        # (frame, correlation matrix) for the frame being mapped
+        self._correlations: Optional[Tuple[pd.DataFrame, pd.DataFrame]] = None
     
     def detect_roles(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """Detect roles for all columns with confidence scores.
@@ -30,12 +54,9 @@ class ColumnRoleMapper:
             role, confidence = self._detect_column_role(df, col)
             
             # Get sample values, converting NaN/inf to None for JSON safety
-            sample_values = []
-            for val in df[col].head(3).tolist():
-                if pd.isna(val) or (isinstance(val, float) and (np.isinf(val) or np.isnan(val))):
-                    sample_values.append(None)
-                else:
-                    sample_values.append(val)
+            head = df[col].head(3)
+            invalid = head.isna() | head.isin(self.INFINITE_VALUES)
+            sample_values = head.astype(object).where(~invalid, None).tolist()
             
             results.append({
                 "name": col,
@@ -45,6 +66,9 @@ class ColumnRoleMapper:
                 "sample_values": sample_values
             })
         
+        # Drop the cached correlations with the frame
+        self._correlations = None
+        
         return results
     
     def _detect_column_role(self, df: pd.DataFrame, col: str) -> tuple:
@@ -82,12 +106,17 @@ class ColumnRoleMapper:
         Returns:
             True if time column
         """
-        time_keywords = ['date', 'time', 'datetime', 'timestamp', 'day', 'month', 'year', 'dt']
-        
         # Check name
-        if any(keyword in col_name for keyword in time_keywords):
+        if self.TIME_PATTERN.search(col_name):
             return True
         
+        if pd.api.types.is_datetime64_any_dtype(data):
+            return True
+        
+        # Numbers would parse as epoch offsets; only probe text values
+        if pd.api.types.is_numeric_dtype(data):
+            return False
+        
         # Try parsing as date
         try:
             pd.to_datetime(data.dropna().head(10))
@@ -129,35 +158,27 @@ class ColumnRoleMapper:
         Returns:
             Tuple of (role, confidence)
         """
-        # ACTION keywords (controllable inputs)
-        action_keywords = ['spend', 'cost', 'budget', 'investment', 'expense', 
-                          'price', 'bid', 'rate', 'allocation']
-        
-        # OUTCOME keywords (KPIs to optimize)
-        outcome_keywords = ['revenue', 'sales', 'profit', 'income', 'earnings',
-                           'return', 'roi', 'conversion', 'ctr', 'roas']
-        
-        # METRIC keywords (supporting metrics)
-        metric_keywords = ['click', 'impression', 'view', 'visitor', 'user',
-                          'engagement', 'bounce', 'session']
-        
         # Check name patterns
-        for keyword in action_keywords:
-            if keyword in col_name:
-                return "ACTION", 0.90
+        if self.ACTION_PATTERN.search(col_name):
+            return "ACTION", 0.90
         
-        for keyword in outcome_keywords:
-            if keyword in col_name:
-                return "OUTCOME", 0.90
+        if self.OUTCOME_PATTERN.search(col_name):
+            return "OUTCOME", 0.90
         
-        for keyword in metric_keywords:
-            if keyword in col_name:
-                return "METRIC", 0.80
+        if self.METRIC_PATTERN.search(col_name):
+            return "METRIC", 0.80
         
-        # Statistical heuristics
-        variance = data.var()
-        mean = data.mean()
-        cv = abs(variance / mean) if mean != 0 else 0  # Coefficient of variation
+        # Statistical heuristics, on the column's non-null values as floats
+        values = data.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        
+        # Coefficient of variation; a sample variance needs two values
+        cv = 0
+        if values.size > 1:
+            with np.errstate(invalid='ignore'):
+                mean = values.mean()
+                if mean != 0:
+                    cv = abs(values.var(ddof=1) / mean)
         
         # High variance relative to mean suggests ACTION or OUTCOME
         if cv > 0.2:
@@ -185,19 +206,41 @@ class ColumnRoleMapper:
         Returns:
             Dict of correlations
         """
-        correlations = {}
-        numeric_cols = df.select_dtypes(include=['number']).columns
-        
-        for col in numeric_cols:
-            if col != data.name:
-                try:
-                    corr = abs(data.corr(df[col]))
-                    if not np.isnan(corr):
-                        correlations[col] = corr
-                except:
-                    pass
-        
-        return correlations
+        numeric_df = df.select_dtypes(include=['number'])
+        
+        if data.name not in numeric_df.columns:
+            # Not part of the numeric block (e.g. boolean)
+            others = numeric_df.loc[:, numeric_df.columns != data.name]
+            return others.corrwith(data).abs().dropna().to_dict()
+        
+        # One pairwise matrix, computed on first use, serves every column
+        # of the frame
+        if self._correlations is None or self._correlations[0] is not df:
+            self._correlations = (df, self._correlation_matrix_for(numeric_df))
+        
+        correlations = self._correlations[1][data.name]
+        return correlations[correlations.index != data.name].dropna().to_dict()
+    
+    def _correlation_matrix_for(self, numeric_df: pd.DataFrame) -> pd.DataFrame:
+        """Calculate absolute pairwise correlations of numeric columns.
+        
+        Args:
+            numeric_df: Numeric columns of a DataFrame
+            
+        Returns:
+            Absolute correlation matrix; pairs with an infinite value
+            among their shared observations are NaN, as with Series.corr
+        """
+        matrix = numeric_df.corr().abs()
+        
+        values = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+        infinite = np.isinf(values).astype(np.int32)
+        if infinite.any():
+            present = (~np.isnan(values)).astype(np.int32)
+            overlaps = infinite.T @ present
+            matrix = matrix.mask((overlaps + overlaps.T) > 0)
+        
+        return matrix
     
     def validate_role_mapping(self, role_mapping: List[Dict[str, str]]) -> Dict[str, Any]:
         """Validate role mapping meets requirements.
@@ -2,12 +2,31 @@
 
 import pandas as pd
 from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
 import re
 
 
+@dataclass(frozen=True)
+class ColumnProfile:
+    """Per-column facts shared by the schema detectors."""
+    columns: List[Any]
+    lower_names: List[str]
+    is_numeric: List[bool]
+    is_datetime: List[bool]
+
+
 class SchemaDetector:
     """Detect and infer schema from data."""
     
+    # Column name keywords, each group compiled into one alternation
+    DATE_KEYWORDS = ['date', 'time', 'datetime', 'timestamp', 'day', 'dt']
+    SPEND_KEYWORDS = ['spend', 'cost', 'expense', 'budget', 'expenditure', 'investment']
+    REVENUE_KEYWORDS = ['revenue', 'sales', 'income', 'earnings', 'profit', 'return']
+    
+    DATE_PATTERN = re.compile('|'.join(map(re.escape, DATE_KEYWORDS)))
+    SPEND_PATTERN = re.compile('|'.join(map(re.escape, SPEND_KEYWORDS)))
+    REVENUE_PATTERN = re.compile('|'.join(map(re.escape, REVENUE_KEYWORDS)))
+    
     def detect_schema(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Detect data types and schema.
         
@@ -17,36 +36,67 @@ class SchemaDetector:
         Returns:
             Dict containing schema information
         """
+        # Inspect names and dtypes once for all detectors
+        profile = self._profile(df)
+        
         schema = {
             "columns": list(df.columns),
             "rows": len(df),
             "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
-            "date_column": self.detect_date_columns(df),
+            "date_column": self.detect_date_columns(df, profile),
             "numeric_columns": self.detect_numeric_columns(df),
-            "spend_column": self._detect_spend_column(df),
-            "revenue_column": self._detect_revenue_column(df),
+            "spend_column": self._detect_spend_column(df, profile),
+            "revenue_column": self._detect_revenue_column(df, profile),
         }
         return schema
     
-    def detect_date_columns(self, df: pd.DataFrame) -> Optional[str]:
+    def _profile(self, df: pd.DataFrame) -> ColumnProfile:
+        """Collect lower-cased names and dtype flags for each column.
+        
+        Args:
+            df: Input DataFrame
+            
+        Returns:
+            ColumnProfile of the DataFrame
+        """
+        dtypes = df.dtypes.tolist()
+        return ColumnProfile(
+            columns=df.columns.tolist(),
+            lower_names=[col.lower() for col in df.columns],
+            is_numeric=[pd.api.types.is_numeric_dtype(dtype) for dtype in dtypes],
+            is_datetime=[pd.api.types.is_datetime64_any_dtype(dtype) for dtype in dtypes],
+        )
+    
+    def detect_date_columns(
+        self, 
+        df: pd.DataFrame, 
+        profile: Optional[ColumnProfile] = None
+    ) -> Optional[str]:
         """Identify date/time columns.
         
         Args:
             df: Input DataFrame
+            profile: Precomputed column profile of df
             
         Returns:
             Name of detected date column or None
         """
-        # Look for common date column names
-        date_keywords = ['date', 'time', 'datetime', 'timestamp', 'day', 'dt']
+        profile = profile or self._profile(df)
         
-        for col in df.columns:
-            col_lower = col.lower()
-            if any(keyword in col_lower for keyword in date_keywords):
+        # Look for common date column names
+        for col, lower_name in zip(profile.columns, profile.lower_names):
+            if self.DATE_PATTERN.search(lower_name):
                 return col
         
-        # Try to parse columns as dates
-        for col in df.columns:
+        # Try to parse columns as dates; numbers would parse as epoch
+        # offsets, so only datetime and text columns are probed
+        for col, is_numeric, is_datetime in zip(
+            profile.columns, profile.is_numeric, profile.is_datetime
+        ):
+            if is_datetime:
+                return col
+            if is_numeric:
+                continue
             try:
                 pd.to_datetime(df[col].dropna().head(10))
                 return col
@@ -95,42 +145,56 @@ class SchemaDetector:
         numeric_cols = self.detect_numeric_columns(df)
         return numeric_cols[0] if numeric_cols else df.columns[0]
     
-    def _detect_spend_column(self, df: pd.DataFrame) -> Optional[str]:
+    def _detect_spend_column(
+        self, 
+        df: pd.DataFrame, 
+        profile: Optional[ColumnProfile] = None
+    ) -> Optional[str]:
         """Detect spend/cost column.
         
         Args:
             df: Input DataFrame
+            profile: Precomputed column profile of df
             
         Returns:
             Detected spend column name or None
         """
-        spend_keywords = ['spend', 'cost', 'expense', 'budget', 'expenditure', 'investment']
-        
-        for col in df.columns:
-            col_lower = col.lower()
-            if any(keyword in col_lower for keyword in spend_keywords):
-                # Verify it's numeric
-                if pd.api.types.is_numeric_dtype(df[col]):
-                    return col
+        profile = profile or self._profile(df)
         
-        return None
+        # First numeric column with a spend keyword in its name
+        return next(
+            (
+                col for col, lower_name, is_numeric in zip(
+                    profile.columns, profile.lower_names, profile.is_numeric
+                )
+                if is_numeric and self.SPEND_PATTERN.search(lower_name)
+            ),
+            None
+        )
     
-    def _detect_revenue_column(self, df: pd.DataFrame) -> Optional[str]:
+    def _detect_revenue_column(
+        self, 
+        df: pd.DataFrame, 
+        profile: Optional[ColumnProfile] = None
+    ) -> Optional[str]:
         """Detect revenue/sales column.
         
         Args:
             df: Input DataFrame
+            profile: Precomputed column profile of df
             
         Returns:
             Detected revenue column name or None
         """
-        revenue_keywords = ['revenue', 'sales', 'income', 'earnings', 'profit', 'return']
+        profile = profile or self._profile(df)
         
-        for col in df.columns:
-            col_lower = col.lower()
-            if any(keyword in col_lower for keyword in revenue_keywords):
-                # Verify it's numeric
-                if pd.api.types.is_numeric_dtype(df[col]):
-                    return col
-        
-        return None
+        # First numeric column with a revenue keyword in its name
+        return next(
+            (
+                col for col, lower_name, is_numeric in zip(
+                    profile.columns, profile.lower_names, profile.is_numeric
+                )
+                if is_numeric and self.REVENUE_PATTERN.search(lower_name)
+            ),
+            None
+        )
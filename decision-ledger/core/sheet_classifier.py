@@ -168,13 +168,15 @@ class SheetClassifier:
         non_null = series.dropna()
         total_count = len(series)
         non_null_count = len(non_null)
+        unique_count = series.nunique()
         
         profile = {
             'name': col_name,
             'dtype': str(series.dtype),
+            'row_count': total_count,
             'null_ratio': 1 - (non_null_count / total_count) if total_count > 0 else 1,
-            'unique_count': series.nunique(),
-            'unique_ratio': series.nunique() / non_null_count if non_null_count > 0 else 0,
+            'unique_count': unique_count,
+            'unique_ratio': unique_count / non_null_count if non_null_count > 0 else 0,
             'semantic_type': ColumnSemanticType.UNKNOWN,
             'is_potential_key': False,
             'statistical_profile': {}